@@ -0,0 +1,144 @@
+"""
+Benchmark the MCP tools of main.py end to end over stdio against the mock Local API.
+
+The mock API runs in this process; main.py runs as a child process exactly as an MCP client would
+launch it. Each scenario calls one tool repeatedly at a fixed concurrency and reports p50/p99
+latency, calls per second and failed calls. The server's peak RSS is reported after it exits.
+Server settings such as ADSPOWER_RATE_LIMIT are taken from the environment.
+
+    python benchmarks/bench_tools.py --profiles 10000 --calls 40 --concurrency 8
+    python benchmarks/bench_tools.py --latency-scale 0 --mock-rate-limit 0 --json results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import uvicorn
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from mock_local_api import MockLocalApi
+
+MAIN = Path(__file__).resolve().parent.parent / "main.py"
+
+def scenarios(api: MockLocalApi) -> List[tuple]:
+    """
+    (label, tool, arguments for call i, number of calls or None for --calls)
+    """
+    user_ids = list(api.profiles)
+    pages = max(len(user_ids) // 100, 1)
+    return [
+        ("get_browser_list", "get_browser_list", lambda i: {"size": 100, "page": i % pages + 1}, None),
+        ("get_browser_list json", "get_browser_list", lambda i: {"size": 100, "page": i % pages + 1, "format": "json", "fields": ["user_id", "name"]}, None),
+        ("get_browser_list all", "get_browser_list", lambda i: {"all": True, "format": "tsv", "fields": ["user_id", "name", "group_id"]}, 2),
+        ("search_browsers", "search_browsers", lambda i: {"name": f"shop-{i % 10}*", "format": "tsv", "fields": ["user_id"]}, None),
+        ("get_group_list", "get_group_list", lambda i: {"size": 100}, None),
+        ("get_application_list", "get_application_list", lambda i: {}, None),
+        ("get_opened_browser", "get_opened_browser", lambda i: {}, None),
+        ("start_browser", "start_browser", lambda i: {"browser_id": user_ids[i % len(user_ids)]}, None),
+        ("close_browser", "close_browser", lambda i: {"browser_id": user_ids[i % len(user_ids)]}, None),
+        ("update_browser", "update_browser", lambda i: {"browser_id": user_ids[i % len(user_ids)], "name": f"bench-{i}"}, None),
+        ("create_browser", "create_browser", lambda i: {
+            "group_id": "1",
+            "name": f"bench-new-{i}",
+            "proxy_config": {"proxy_soft": "no_proxy", "proxy_type": None, "proxy_host": None, "proxy_port": None,
+                             "proxy_user": None, "proxy_password": None, "proxy_url": None, "global_config": None},
+        }, None),
+    ]
+
+async def run_scenario(session: ClientSession, tool: str, make_args: Callable[[int], Dict[str, Any]], calls: int, concurrency: int) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def call(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            result = await session.call_tool(tool, make_args(i))
+            latencies.append(time.perf_counter() - started)
+            text = result.content[0].text if result.content else ""
+            if result.isError or text.startswith("Failed"):
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(calls)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "calls": calls,
+        "errors": errors,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "calls_per_sec": calls / elapsed,
+    }
+
+def peak_child_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    api = MockLocalApi(args.profiles, args.groups, args.mock_rate_limit, args.latency_scale, args.seed)
+    mock = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=args.port, log_level="warning"))
+    mock_task = asyncio.create_task(mock.serve())
+    while not mock.started:
+        await asyncio.sleep(0.05)
+
+    env = {**os.environ, "ADSPOWER_LOCAL_API_BASE": f"http://127.0.0.1:{args.port}", "FASTMCP_LOG_LEVEL": "WARNING"}
+    server = StdioServerParameters(command=sys.executable, args=[str(MAIN)], env=env)
+    results: Dict[str, Any] = {"scenarios": {}}
+    try:
+        started = time.perf_counter()
+        async with stdio_client(server) as (read, write), ClientSession(read, write) as session:
+            await session.initialize()
+            await session.list_tools()
+            results["time_to_tool_list_ms"] = (time.perf_counter() - started) * 1000
+            for label, tool, make_args, calls in scenarios(api):
+                if args.only and label not in args.only:
+                    continue
+                results["scenarios"][label] = await run_scenario(session, tool, make_args, calls or args.calls, args.concurrency)
+                print(f"  {label}: done", file=sys.stderr)
+    finally:
+        mock.should_exit = True
+        await mock_task
+    results["server_peak_rss_mb"] = peak_child_rss_mb()
+    results["mock_throttled_requests"] = api.throttled
+    return results
+
+def print_report(results: Dict[str, Any]) -> None:
+    print(f"{'scenario':<24}{'calls':>7}{'errors':>8}{'p50 ms':>10}{'p99 ms':>10}{'calls/s':>10}")
+    for label, row in results["scenarios"].items():
+        print(f"{label:<24}{row['calls']:>7}{row['errors']:>8}{row['p50_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['calls_per_sec']:>10.2f}")
+    print(f"time to tool list: {results['time_to_tool_list_ms']:.0f} ms")
+    print(f"server peak RSS: {results['server_peak_rss_mb']:.1f} MB")
+    print(f"requests throttled by the mock API: {results['mock_throttled_requests']}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=50326, help="port for the mock Local API")
+    parser.add_argument("--profiles", type=int, default=1000)
+    parser.add_argument("--groups", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=20, help="calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=4, help="calls in flight per scenario")
+    parser.add_argument("--mock-rate-limit", type=float, default=5, help="mock requests per second per path, 0 disables")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiplier for the mock's simulated latency")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="*", help="run only these scenario labels")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
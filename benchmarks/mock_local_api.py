@@ -0,0 +1,272 @@
+"""
+Stand-in for the AdsPower Local API, so main.py can be developed and benchmarked without the desktop app.
+
+It serves every path in main.API_ENDPOINTS from in-memory state, with simulated per-endpoint latency,
+the Local API's per-second rate limit and its 100-item page and batch limits.
+
+    python benchmarks/mock_local_api.py --port 50326 --profiles 10000
+    ADSPOWER_LOCAL_API_BASE=http://127.0.0.1:50326 python main.py
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from main import API_ENDPOINTS, API_METHODS  # noqa: E402
+
+# 各接口的模拟延迟 (秒): (均值, 抖动)
+LATENCY = {
+    "start_browser": (1.2, 0.4),
+    "close_browser": (0.3, 0.1),
+    "create_browser": (0.08, 0.03),
+    "update_browser": (0.06, 0.02),
+    "delete_browser": (0.06, 0.02),
+    "move_browser": (0.05, 0.02),
+}
+DEFAULT_LATENCY = (0.02, 0.01)
+
+MAX_PAGE_SIZE = 100
+MAX_BATCH_SIZE = 100
+THROTTLED = {"code": -1, "msg": "Too many request per second, please check"}
+
+def ok(data: Any = None) -> Dict[str, Any]:
+    return {"code": 0, "msg": "Success", "data": data if data is not None else {}}
+
+def fail(msg: str) -> Dict[str, Any]:
+    return {"code": -1, "msg": msg}
+
+def paginate(rows: List[Dict[str, Any]], params: Dict[str, str]) -> Dict[str, Any]:
+    page = max(int(params.get("page") or 1), 1)
+    page_size = min(max(int(params.get("page_size") or 1), 1), MAX_PAGE_SIZE)
+    start = (page - 1) * page_size
+    return ok({"list": rows[start:start + page_size], "page": page, "page_size": page_size})
+
+class MockLocalApi:
+    """
+    In-memory AdsPower Local API. Every request path has its own one-second rate limit window,
+    like the real API, and is answered after a randomized delay scaled by `latency_scale`.
+    """
+    def __init__(self, profiles: int = 1000, groups: int = 20, rate_limit: float = 5, latency_scale: float = 1.0, seed: int = 0):
+        self.rate_limit = rate_limit
+        self.latency_scale = latency_scale
+        self.random = random.Random(seed)
+        self.groups: Dict[str, Dict[str, Any]] = OrderedDict()
+        self.profiles: Dict[str, Dict[str, Any]] = OrderedDict()
+        self.opened: Dict[str, Dict[str, Any]] = {}
+        self.applications = [{"id": str(i), "name": name} for i, name in enumerate(["Facebook", "Amazon", "TikTok", "Shopify", "eBay"], 1)]
+        self.requests: Dict[str, List[float]] = {}
+        self.throttled = 0
+        self._next_serial = 1
+        self._next_port = 20000
+        for i in range(1, groups + 1):
+            self.groups[str(i)] = {"group_id": str(i), "group_name": f"group-{i}", "remark": ""}
+        for i in range(profiles):
+            self._add_profile({
+                "group_id": str(i % groups + 1) if groups else "0",
+                "name": f"shop-{i}",
+                "user_proxy_config": {
+                    "proxy_soft": "other",
+                    "proxy_type": self.random.choice(["http", "socks5"]),
+                    "proxy_host": f"10.0.{i % 256}.{i % 97}",
+                    "proxy_port": str(8000 + i % 1000),
+                },
+                "fingerprint_config": {
+                    "language": ["en-US"],
+                    "webrtc": "disabled",
+                    "browser_kernel_config": {"version": self.random.choice(["130", "132", "134"]), "type": "chrome"},
+                },
+            })
+        self.app = Starlette(routes=[
+            Route(path, self.handle, methods=[API_METHODS.get(endpoint, "POST")])
+            for endpoint, path in API_ENDPOINTS.items()
+        ])
+        self._endpoints = {path: endpoint for endpoint, path in API_ENDPOINTS.items()}
+
+    def _add_profile(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        serial_number = str(self._next_serial)
+        self._next_serial += 1
+        user_id = f"k{int(serial_number):07x}"
+        group_id = fields.get("group_id", "0")
+        profile = {
+            "serial_number": serial_number,
+            "user_id": user_id,
+            "name": fields.get("name", ""),
+            "group_id": group_id,
+            "group_name": self.groups.get(group_id, {}).get("group_name", ""),
+            "domain_name": fields.get("domain_name", ""),
+            "username": fields.get("username", ""),
+            "remark": fields.get("remark", ""),
+            "created_time": str(int(time.time())),
+            "ip": "",
+            "ip_country": fields.get("country", ""),
+            "password": "",
+            "last_open_time": "",
+            "user_proxy_config": fields.get("user_proxy_config", {"proxy_soft": "no_proxy"}),
+            "fingerprint_config": fields.get("fingerprint_config", {}),
+        }
+        self.profiles[user_id] = profile
+        return profile
+
+    def _throttled(self, path: str) -> bool:
+        if self.rate_limit <= 0:
+            return False
+        now = time.monotonic()
+        window = [t for t in self.requests.get(path, []) if now - t < 1.0]
+        if len(window) >= self.rate_limit:
+            self.requests[path] = window
+            self.throttled += 1
+            return True
+        window.append(now)
+        self.requests[path] = window
+        return False
+
+    async def handle(self, request: Request) -> JSONResponse:
+        endpoint = self._endpoints[request.url.path]
+        if self._throttled(request.url.path):
+            return JSONResponse(THROTTLED)
+        mean, jitter = LATENCY.get(endpoint, DEFAULT_LATENCY)
+        await asyncio.sleep(max(0.0, self.random.uniform(mean - jitter, mean + jitter)) * self.latency_scale)
+        params = dict(request.query_params)
+        body = await request.json() if request.method == "POST" else {}
+        return JSONResponse(getattr(self, endpoint)(params, body))
+
+    def _find(self, params: Dict[str, str]) -> Dict[str, Any]:
+        if params.get("user_id"):
+            return self.profiles.get(params["user_id"])
+        for profile in self.profiles.values():
+            if profile["serial_number"] == params.get("serial_number"):
+                return profile
+        return None
+
+    def start_browser(self, params: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+        profile = self._find(params)
+        if profile is None:
+            return fail("user_id is not exist")
+        if profile["user_id"] not in self.opened:
+            self._next_port += 1
+            port = str(self._next_port)
+            self.opened[profile["user_id"]] = {
+                "ws": {
+                    "selenium": f"127.0.0.1:{port}",
+                    "puppeteer": f"ws://127.0.0.1:{port}/devtools/browser/{profile['user_id']}",
+                },
+                "debug_port": port,
+                "webdriver": "/mock/chromedriver",
+            }
+        return ok(self.opened[profile["user_id"]])
+
+    def close_browser(self, params: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+        profile = self._find(params)
+        if profile is None:
+            return fail("user_id is not exist")
+        self.opened.pop(profile["user_id"], None)
+        return ok()
+
+    def get_opened_browser(self, params: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+        return ok({"list": [{"user_id": user_id, **info} for user_id, info in self.opened.items()]})
+
+    def create_browser(self, params: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+        if "user_proxy_config" not in body:
+            return fail("user_proxy_config is required")
+        if body.get("group_id") not in self.groups and body.get("group_id") != "0":
+            return fail("group_id is not exist")
+        profile = self._add_profile(body)
+        return ok({"id": profile["user_id"], "serial_number": profile["serial_number"]})
+
+    def get_browser_list(self, params: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+        rows = list(self.profiles.values())
+        for key in ("user_id", "group_id", "serial_number"):
+            if params.get(key):
+                rows = [row for row in rows if row[key] == params[key]]
+        return paginate(rows, params)
+
+    def update_browser(self, params: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+        profile = self.profiles.get(body.get("user_id"))
+        if profile is None:
+            return fail("user_id is not exist")
+        profile.update({key: value for key, value in body.items() if key != "user_id"})
+        if "group_id" in body:
+            profile["group_name"] = self.groups.get(body["group_id"], {}).get("group_name", "")
+        return ok()
+
+    def _check_batch(self, user_ids: List[str]) -> str:
+        if not user_ids:
+            return "user_ids is required"
+        if len(user_ids) > MAX_BATCH_SIZE:
+            return f"user_ids exceeds the limit of {MAX_BATCH_SIZE}"
+        # 与真实接口一致, 错误信息不包含具体是哪些 ID
+        if any(user_id not in self.profiles for user_id in user_ids):
+            return "user_id is not exist"
+        return None
+
+    def delete_browser(self, params: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+        error = self._check_batch(body.get("user_ids"))
+        if error:
+            return fail(error)
+        for user_id in body["user_ids"]:
+            del self.profiles[user_id]
+            self.opened.pop(user_id, None)
+        return ok()
+
+    def move_browser(self, params: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+        error = self._check_batch(body.get("user_ids"))
+        if error:
+            return fail(error)
+        group = self.groups.get(body.get("group_id"))
+        if group is None:
+            return fail("group_id is not exist")
+        for user_id in body["user_ids"]:
+            self.profiles[user_id].update(group_id=group["group_id"], group_name=group["group_name"])
+        return ok()
+
+    def get_group_list(self, params: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+        rows = list(self.groups.values())
+        if params.get("group_name"):
+            rows = [row for row in rows if params["group_name"] in row["group_name"]]
+        return paginate(rows, params)
+
+    def create_group(self, params: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+        if any(group["group_name"] == body.get("group_name") for group in self.groups.values()):
+            return fail("group_name already exists")
+        group_id = str(max(map(int, self.groups), default=0) + 1)
+        self.groups[group_id] = {"group_id": group_id, "group_name": body.get("group_name"), "remark": body.get("remark", "")}
+        return ok({"group_id": group_id, "group_name": body.get("group_name")})
+
+    def update_group(self, params: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+        group = self.groups.get(body.get("group_id"))
+        if group is None:
+            return fail("group_id is not exist")
+        group["group_name"] = body.get("group_name", group["group_name"])
+        if "remark" in body:
+            group["remark"] = body["remark"]
+        return ok()
+
+    def get_application_list(self, params: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+        return paginate(self.applications, params)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=50326)
+    parser.add_argument("--profiles", type=int, default=1000, help="number of generated profiles")
+    parser.add_argument("--groups", type=int, default=20, help="number of generated groups")
+    parser.add_argument("--rate-limit", type=float, default=5, help="requests per second per path, 0 disables")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiplier for simulated latency, 0 disables")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    api = MockLocalApi(args.profiles, args.groups, args.rate_limit, args.latency_scale, args.seed)
+    uvicorn.run(api.app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
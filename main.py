@@ -1,37 +1,490 @@
-from typing import Any, List, Optional, Dict, TypedDict, Literal, Union
+import time
+_process_started = time.perf_counter()
+
+import asyncio
+import collections
+import functools
+import hashlib
+import heapq
+import importlib.metadata
+import inspect
+import io
+import itertools
+import json
+import logging
+import os
+import random
+import sqlite3
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Dict, Sequence, TypedDict, Literal, Union
 import httpx
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.server.fastmcp.tools import Tool
+from mcp.server.fastmcp.utilities.func_metadata import FuncMetadata, func_metadata
+from pydantic import VERSION as PYDANTIC_VERSION, ConfigDict, ValidationError
 
-# Initialize FastMCP server
-mcp = FastMCP("adspower-local-api")
+# 启动各阶段耗时 (秒), 以 main.py 开始执行为起点
+STARTUP_TIMES: Dict[str, float] = {"imports": time.perf_counter() - _process_started}
+logger = logging.getLogger(__name__)
 
 # Constants
-LOCAL_API_BASE = "http://127.0.0.1:50325"
+LOCAL_API_BASE = os.getenv("ADSPOWER_LOCAL_API_BASE", "http://127.0.0.1:50325")
+
+# HTTP 连接池与超时配置, 可通过环境变量覆盖
+HTTP_TIMEOUT = float(os.getenv("ADSPOWER_HTTP_TIMEOUT", "60"))  # seconds, browser start can be slow
+HTTP_CONNECT_TIMEOUT = float(os.getenv("ADSPOWER_HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("ADSPOWER_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("ADSPOWER_HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("ADSPOWER_HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# 本地 API 限流配置: 每类接口每秒请求数 (0 表示不限流), 可按类别单独覆盖
+RATE_LIMIT = float(os.getenv("ADSPOWER_RATE_LIMIT", "2"))
+RATE_BURST = int(os.getenv("ADSPOWER_RATE_BURST", "2"))
+THROTTLE_MAX_RETRIES = int(os.getenv("ADSPOWER_THROTTLE_RETRIES", "5"))
+THROTTLE_BACKOFF = float(os.getenv("ADSPOWER_THROTTLE_BACKOFF", "0.5"))  # seconds, doubled per retry
+THROTTLE_BACKOFF_MAX = float(os.getenv("ADSPOWER_THROTTLE_BACKOFF_MAX", "8"))
+
+# 批量操作的默认并发数
+BULK_CONCURRENCY = int(os.getenv("ADSPOWER_BULK_CONCURRENCY", "5"))
+
+# 批量删除/移动时每个请求携带的 user_ids 数量 (Local API 上限 100)
+BATCH_SIZE = min(int(os.getenv("ADSPOWER_BATCH_SIZE", "100")), 100)
+# 只由个别 ID 引起的批量错误, 失败的批次只在出现这些错误时才拆分重试
+PER_ID_ERRORS = ("user_id is not exist",)
+
+# 分页配置: 单页最大条数 (Local API 上限 100), 全量模式下并发预取的页数与内存上限 (条)
+LIST_PAGE_SIZE = 100
+LIST_PREFETCH_PAGES = int(os.getenv("ADSPOWER_LIST_PREFETCH_PAGES", "3"))
+LIST_MAX_ITEMS = int(os.getenv("ADSPOWER_LIST_MAX_ITEMS", "50000"))
+
+# 列表接口缓存: 过期时间 (秒, 0 表示关闭) 与最大条目数
+CACHE_TTL = float(os.getenv("ADSPOWER_CACHE_TTL", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("ADSPOWER_CACHE_MAX_ENTRIES", "256"))
+
+# 本地浏览器索引: SQLite 文件路径 (默认仅在内存中), 超过该时长 (秒) 的索引在搜索前自动重建
+INDEX_PATH = os.getenv("ADSPOWER_INDEX_PATH", ":memory:")
+INDEX_MAX_AGE = float(os.getenv("ADSPOWER_INDEX_MAX_AGE", "3600"))
+
+# 已打开浏览器状态的后台同步间隔 (秒): 状态变化后使用最短间隔, 无变化时逐步翻倍到最长间隔
+TRACKER_MIN_INTERVAL = float(os.getenv("ADSPOWER_TRACKER_MIN_INTERVAL", "2"))
+TRACKER_MAX_INTERVAL = float(os.getenv("ADSPOWER_TRACKER_MAX_INTERVAL", "60"))
+
+# 预热浏览器池: 预先启动的分组与空闲浏览器数量, 池内打开上限, 多余空闲浏览器的关闭超时与健康检查间隔 (秒)
+POOL_GROUP_ID = os.getenv("ADSPOWER_POOL_GROUP_ID")
+POOL_SIZE = int(os.getenv("ADSPOWER_POOL_SIZE", "0"))
+POOL_MAX_OPEN = int(os.getenv("ADSPOWER_POOL_MAX_OPEN", "10"))
+POOL_IDLE_TIMEOUT = float(os.getenv("ADSPOWER_POOL_IDLE_TIMEOUT", "600"))
+POOL_CHECK_INTERVAL = float(os.getenv("ADSPOWER_POOL_CHECK_INTERVAL", "30"))
+
+# 监控指标: Prometheus 文本文件路径与写入间隔 (秒), 以及逐次调用的跟踪日志 (JSONL) 路径
+METRICS_FILE = os.getenv("ADSPOWER_METRICS_FILE")
+METRICS_INTERVAL = float(os.getenv("ADSPOWER_METRICS_INTERVAL", "15"))
+TRACE_LOG = os.getenv("ADSPOWER_TRACE_LOG")
+
+# 延迟直方图的桶边界 (秒)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+METRIC_HELP = {
+    "adspower_tool_duration_seconds": ("histogram", "Tool call latency, including rendering the result"),
+    "adspower_tool_queue_seconds": ("histogram", "Time a tool call waited for a concurrency slot"),
+    "adspower_tool_in_flight": ("gauge", "Tool calls currently running"),
+    "adspower_tool_failures_total": ("counter", "Tool calls that raised or returned a failure message"),
+    "adspower_tool_response_bytes_total": ("counter", "Bytes of text returned by tools"),
+    "adspower_api_queue_seconds": ("histogram", "Time a Local API request waited for the rate limiter"),
+    "adspower_api_duration_seconds": ("histogram", "Local API HTTP round trip time"),
+    "adspower_api_decode_seconds": ("histogram", "Time spent decoding Local API responses"),
+    "adspower_api_in_flight": ("gauge", "Local API requests currently on the wire"),
+    "adspower_api_errors_total": ("counter", "Local API responses with code != 0, by message"),
+    "adspower_api_retries_total": ("counter", "Local API requests retried after throttling"),
+    "adspower_api_coalesced_total": ("counter", "Reads that joined an identical request already in flight"),
+    "adspower_api_request_bytes_total": ("counter", "Bytes sent to the Local API"),
+    "adspower_api_response_bytes_total": ("counter", "Bytes received from the Local API"),
+    "adspower_pool_lease_seconds": ("histogram", "Time to lease a browser from the pool, warm or cold started"),
+    "adspower_startup_seconds": ("gauge", "Time spent in each startup phase, from main.py starting to run"),
+}
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation within its bucket, clamped to the observed range.
+        """
+        estimate = self._bucket_quantile(q)
+        return None if estimate is None else min(max(estimate, self.min), self.max)
+
+    def _bucket_quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+class Metrics:
+    """
+    In-process counters, gauges and latency histograms, keyed on metric name and a tuple of label pairs.
+    """
+    def __init__(self):
+        self.histograms: Dict[str, Dict[tuple, Histogram]] = collections.defaultdict(dict)
+        self.counters: Dict[str, Dict[tuple, float]] = collections.defaultdict(lambda: collections.defaultdict(float))
+        self.gauges: Dict[str, Dict[tuple, float]] = collections.defaultdict(lambda: collections.defaultdict(float))
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = tuple(labels.items())
+        histogram = self.histograms[name].get(key)
+        if histogram is None:
+            histogram = self.histograms[name][key] = Histogram()
+        histogram.observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        self.counters[name][tuple(labels.items())] += value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        self.gauges[name][tuple(labels.items())] = value
+
+    @contextmanager
+    def in_flight(self, name: str, **labels: str) -> Iterator[None]:
+        key = tuple(labels.items())
+        self.gauges[name][key] += 1
+        try:
+            yield
+        finally:
+            self.gauges[name][key] -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        JSON-friendly view with count, mean and estimated p50/p99 (in ms) per histogram series.
+        """
+        def series(key: tuple) -> str:
+            return ",".join(f"{name}={value}" for name, value in key) or "all"
+
+        result: Dict[str, Any] = {}
+        for name, by_labels in self.histograms.items():
+            result[name] = {
+                series(key): {
+                    "count": h.count,
+                    "mean_ms": round(h.sum / h.count * 1000, 2),
+                    "p50_ms": round(h.quantile(0.5) * 1000, 2),
+                    "p99_ms": round(h.quantile(0.99) * 1000, 2),
+                }
+                for key, h in by_labels.items()
+            }
+        for values in (self.counters, self.gauges):
+            for name, by_labels in values.items():
+                result[name] = {series(key): value for key, value in by_labels.items()}
+        result["adspower_cache"] = api_cache.stats()
+        return result
+
+    def to_prometheus(self) -> str:
+        def labels(key: tuple) -> str:
+            if not key:
+                return ""
+            escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ") for _, value in key)
+            return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(key, escaped)) + "}"
+
+        def header(name: str) -> List[str]:
+            kind, help_text = METRIC_HELP.get(name, ("untyped", name))
+            return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+        lines: List[str] = []
+        for name, by_labels in self.histograms.items():
+            lines.extend(header(name))
+            for key, h in by_labels.items():
+                cumulative = 0
+                for bound, count in zip((*h.buckets, "+Inf"), h.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{labels((*key, ('le', bound)))} {cumulative}")
+                lines.append(f"{name}_sum{labels(key)} {h.sum}")
+                lines.append(f"{name}_count{labels(key)} {h.count}")
+        for values in (self.counters, self.gauges):
+            for name, by_labels in values.items():
+                lines.extend(header(name))
+                lines.extend(f"{name}{labels(key)} {value}" for key, value in by_labels.items())
+        cache = api_cache.stats()
+        for stat in ("hits", "misses", "evictions", "invalidations"):
+            lines.append(f"# TYPE adspower_cache_{stat}_total counter")
+            lines.append(f"adspower_cache_{stat}_total {cache[stat]}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus_file(self, path: str) -> None:
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+metrics = Metrics()
+_trace_file = None
+
+def trace(record: Dict[str, Any]) -> None:
+    """
+    Append one call record to the ADSPOWER_TRACE_LOG file, if tracing is enabled.
+    """
+    global _trace_file
+    if not TRACE_LOG:
+        return
+    if _trace_file is None:
+        _trace_file = open(TRACE_LOG, "a", encoding="utf-8", buffering=1)
+    _trace_file.write(json.dumps({"ts": round(time.time(), 6), **record}, ensure_ascii=False) + "\n")
+
+async def write_metrics_periodically(path: str) -> None:
+    try:
+        while True:
+            await asyncio.sleep(METRICS_INTERVAL)
+            metrics.write_prometheus_file(path)
+    finally:
+        metrics.write_prometheus_file(path)
+
+# 工具参数 JSON Schema 的磁盘缓存文件 (main.py 或 pydantic 版本变化时失效), 未设置时不缓存
+SCHEMA_CACHE = os.getenv("ADSPOWER_SCHEMA_CACHE")
+
+# 同时执行的工具调用上限 (0 表示不限制), SSE 模式下由所有会话共享
+MAX_CONCURRENT_TOOLS = int(os.getenv("ADSPOWER_MAX_CONCURRENT_TOOLS", "0"))
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+def _new_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=LOCAL_API_BASE,
+        timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared keep-alive client, creating it if the server lifespan has not.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _new_http_client()
+    return _http_client
+
+_lifespan_sessions = 0
+_background_tasks: List[asyncio.Task] = []
+
+@asynccontextmanager
+async def app_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """
+    Open the pooled HTTP client and run the opened-browser tracker, the warm browser pool (and the
+    metrics file writer, if configured) for the lifetime of the server. Idle pooled browsers are
+    closed on shutdown.
+
+    With the SSE transport every client connection enters the lifespan too, so it is refcounted:
+    the shared resources are started on first entry and stopped on last exit. The SSE app also
+    holds it for the whole process, so they are stopped at server shutdown, not when the last
+    client disconnects.
+    """
+    global _http_client, _lifespan_sessions, _background_tasks
+    _lifespan_sessions += 1
+    if _lifespan_sessions == 1:
+        get_http_client()
+        _background_tasks = [asyncio.create_task(browser_tracker.run()), asyncio.create_task(browser_pool.run())]
+        if METRICS_FILE:
+            _background_tasks.append(asyncio.create_task(write_metrics_periodically(METRICS_FILE)))
+    try:
+        yield
+    finally:
+        _lifespan_sessions -= 1
+        if _lifespan_sessions == 0:
+            tasks, _background_tasks = _background_tasks, []
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await browser_pool.close_idle()
+            if _http_client is not None:
+                await _http_client.aclose()
+                _http_client = None
+
+class ToolSchemaCache:
+    """
+    Tool parameter schemas saved to disk, so a new process can register its tools without
+    building their pydantic models and JSON schemas. The file is keyed on a hash of main.py and
+    the pydantic and mcp versions, and ignored when any of them has changed.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(__file__, "rb") as f:
+            versions = f"{PYDANTIC_VERSION} {importlib.metadata.version('mcp')}"
+            self.key = hashlib.sha256(f.read() + versions.encode()).hexdigest()
+        self.tools: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.dirty = False
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("key") == self.key:
+                self.tools = data["tools"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        entry = self.tools.get(name)
+        self.hits += entry is not None
+        return entry
+
+    def set(self, name: str, entry: Dict[str, Any]) -> None:
+        self.tools[name] = entry
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": self.key, "tools": self.tools}, f)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+class CachedSchemaTool(Tool):
+    """
+    Tool registered from a cached schema. The argument model used to validate calls is only built
+    on the first call.
+    """
+    fn_metadata: Optional[FuncMetadata] = None
+
+    async def run(self, arguments: Dict[str, Any], context: Optional[Context] = None) -> Any:
+        if self.fn_metadata is None:
+            self.fn_metadata = func_metadata(self.fn, skip_names=[self.context_kwarg] if self.context_kwarg else [])
+        return await super().run(arguments, context)
+
+class AdsPowerMCP(FastMCP):
+    """
+    FastMCP server that records latency, in-flight, failure and payload size metrics for every tool
+    call, optionally caps how many tool calls run at once across all sessions, and serves
+    Prometheus metrics at /metrics in SSE mode. With a schema cache, tools whose schema is cached
+    are registered without generating it.
+    """
+    def __init__(self, *args: Any, schema_cache: Optional[str] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._tool_slots: Optional[asyncio.Semaphore] = None
+        self.schema_cache = ToolSchemaCache(schema_cache) if schema_cache else None
+
+    def add_tool(self, fn: Callable[..., Any], name: Optional[str] = None, description: Optional[str] = None) -> None:
+        name = name or fn.__name__
+        cached = self.schema_cache.get(name) if self.schema_cache else None
+        if cached is None:
+            super().add_tool(fn, name=name, description=description)
+            if self.schema_cache:
+                tool = self._tool_manager.get_tool(name)
+                self.schema_cache.set(name, {"parameters": tool.parameters, "context_kwarg": tool.context_kwarg})
+            return
+        self._tool_manager._tools[name] = CachedSchemaTool(
+            fn=fn,
+            name=name,
+            description=description or fn.__doc__ or "",
+            parameters=cached["parameters"],
+            is_async=inspect.iscoroutinefunction(fn),
+            context_kwarg=cached["context_kwarg"],
+        )
+
+    async def list_tools(self) -> List[Any]:
+        tools = await super().list_tools()
+        if "first_tool_list" not in STARTUP_TIMES:
+            STARTUP_TIMES["first_tool_list"] = time.perf_counter() - _process_started
+            metrics.set("adspower_startup_seconds", STARTUP_TIMES["first_tool_list"], phase="first_tool_list")
+            logger.info("First tool list served %.0f ms after start", STARTUP_TIMES["first_tool_list"] * 1000)
+        return tools
+
+    def set_max_concurrency(self, limit: int) -> None:
+        self._tool_slots = asyncio.Semaphore(limit) if limit > 0 else None
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Sequence[Any]:
+        started = time.perf_counter()
+        failed = True
+        size = 0
+        try:
+            if self._tool_slots is not None:
+                await self._tool_slots.acquire()
+            metrics.observe("adspower_tool_queue_seconds", time.perf_counter() - started, tool=name)
+            try:
+                with metrics.in_flight("adspower_tool_in_flight", tool=name):
+                    content = await super().call_tool(name, arguments)
+            finally:
+                if self._tool_slots is not None:
+                    self._tool_slots.release()
+            size = sum(len(getattr(item, "text", "")) for item in content)
+            failed = any(getattr(item, "text", "").startswith("Failed") for item in content)
+            return content
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.observe("adspower_tool_duration_seconds", elapsed, tool=name)
+            metrics.inc("adspower_tool_response_bytes_total", size, tool=name)
+            if failed:
+                metrics.inc("adspower_tool_failures_total", tool=name)
+            trace({"kind": "tool", "tool": name, "ms": round(elapsed * 1000, 3), "bytes": size, "failed": failed})
+
+    def sse_app(self) -> Any:
+        from starlette.requests import Request
+        from starlette.responses import PlainTextResponse
+        from starlette.routing import Route
+
+        async def prometheus_metrics(request: Request) -> PlainTextResponse:
+            return PlainTextResponse(metrics.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+        # 整个服务进程持有一次 lifespan, 最后一个客户端断开时不会关闭浏览器池, 只在进程退出时清理
+        @asynccontextmanager
+        async def server_lifespan(app: Any) -> AsyncIterator[None]:
+            async with app_lifespan(self):
+                yield
+
+        app = super().sse_app()
+        app.router.routes.append(Route("/metrics", endpoint=prometheus_metrics))
+        app.router.lifespan_context = server_lifespan
+        return app
+
+# Initialize FastMCP server
+mcp = AdsPowerMCP("adspower-local-api", lifespan=app_lifespan, schema_cache=SCHEMA_CACHE)
+
+# 配置类型拒绝未定义的字段, 避免拼写错误的字段被静默丢弃
+STRICT_CONFIG = ConfigDict(extra="forbid")
 
 # 定义代理配置的类型
 class ProxyConfig(TypedDict):
-    proxy_soft: str  # ['brightdata', 'brightauto', 'oxylabsauto', '922S5auto', 'ipideeauto', 'ipfoxyauto', '922S5auth', 'kookauto', 'ssh', 'other', 'no_proxy']
-    proxy_type: Optional[str]  # ['http', 'https', 'socks5', 'no_proxy']
+    __pydantic_config__ = STRICT_CONFIG
+    proxy_soft: Literal["brightdata", "brightauto", "oxylabsauto", "922S5auto", "ipideeauto", "ipfoxyauto", "922S5auth", "kookauto", "ssh", "other", "no_proxy"]
+    proxy_type: Optional[Literal["http", "https", "socks5", "no_proxy"]]
     proxy_host: Optional[str]  # e.g., "127.0.0.1"
     proxy_port: Optional[str]  # e.g., "8080"
     proxy_user: Optional[str]  # proxy username
     proxy_password: Optional[str]  # proxy password
     proxy_url: Optional[str]  # e.g., "http://127.0.0.1:8080"
-    global_config: Optional[str]  # "0" or "1", default is "0"
+    global_config: Optional[Literal["0", "1"]]  # default is "0"
 
 # 定义浏览器内核配置类型
 class BrowserKernelConfig(TypedDict, total=False):
-    version: Union[Literal["92"], Literal["99"], Literal["102"], Literal["105"], 
-                  Literal["108"], Literal["111"], Literal["114"], Literal["115"], 
-                  Literal["116"], Literal["117"], Literal["118"], Literal["119"], 
-                  Literal["120"], Literal["121"], Literal["122"], Literal["123"], 
-                  Literal["124"], Literal["125"], Literal["126"], Literal["127"], 
-                  Literal["128"], Literal["129"], Literal["130"], Literal["131"], 
-                  Literal["132"], Literal["133"], Literal["134"], Literal["ua_auto"]]  # default is "ua_auto"
+    __pydantic_config__ = STRICT_CONFIG
+    version: Literal["92", "99", "102", "105", "108", "111", "114", "115",
+                     "116", "117", "118", "119", "120", "121", "122", "123",
+                     "124", "125", "126", "127", "128", "129", "130", "131",
+                     "132", "133", "134", "ua_auto"]  # default is "ua_auto"
     type: Literal["chrome", "firefox"]  # default is "chrome"
 
 # 定义随机 UA 配置类型
 class RandomUaConfig(TypedDict, total=False):
+    __pydantic_config__ = STRICT_CONFIG
     ua_version: List[str]
     ua_system_version: List[Literal[
         "Android 9", "Android 10", "Android 11", "Android 12", "Android 13",
@@ -43,6 +496,7 @@ class RandomUaConfig(TypedDict, total=False):
 
 # 定义指纹配置类型
 class FingerprintConfig(TypedDict, total=False):
+    __pydantic_config__ = STRICT_CONFIG
     automatic_timezone: Literal["0", "1"]  # default is "0"
     timezone: str  # e.g., "Asia/Shanghai"
     language: List[str]  # e.g., ["en-US", "zh-CN"]
@@ -54,6 +508,66 @@ class FingerprintConfig(TypedDict, total=False):
     tls_switch: Literal["0", "1"]
     tls: str  # TLS configuration string
 
+# 必须填写代理主机与端口的代理类型, 以及 proxy_soft 为 other 时可用的 proxy_type
+PROXY_SOFT_WITH_HOST = ("other", "ssh")
+PROXY_TYPES_FOR_OTHER = ("http", "https", "socks5")
+
+# Cookie 可以是 JSON 数组 (或其字符串形式), 也可以是 Netscape cookies.txt 文本
+Cookie = Union[str, List[Dict[str, Any]]]
+
+def cookie_errors(cookie: Cookie) -> List[str]:
+    """
+    Check a cookie: a JSON array of cookie objects (or one object), each with a string name and a
+    non-empty domain, or Netscape cookies.txt lines of 7 tab-separated fields.
+    """
+    cookies = cookie
+    if isinstance(cookie, str):
+        text = cookie.strip()
+        if not text.startswith(("[", "{")):
+            lines = [(number, line) for number, line in enumerate(text.splitlines(), 1)
+                     if line.strip() and (not line.startswith("#") or line.startswith("#HttpOnly_"))]
+            return [f"line {number}: expected a JSON array or 7 tab-separated Netscape cookie fields"
+                    for number, line in lines if len(line.split("\t")) != 7]
+        try:
+            cookies = json.loads(text)
+        except ValueError as e:
+            return [f"invalid JSON: {e}"]
+    errors = []
+    for index, item in enumerate(cookies if isinstance(cookies, list) else [cookies]):
+        if not isinstance(item, dict):
+            errors.append(f"[{index}]: expected a cookie object")
+            continue
+        if not isinstance(item.get("name"), str):
+            errors.append(f"[{index}].name: required string")
+        if not item.get("domain") or not isinstance(item["domain"], str):
+            errors.append(f"[{index}].domain: required non-empty string")
+    return errors
+
+def profile_rule_errors(arguments: Dict[str, Any]) -> List[str]:
+    """
+    Checks of create/update arguments that their types cannot express, as "field: message" strings.
+    Also accepts raw, not yet type-checked specs; fields of the wrong type are skipped.
+    """
+    errors = []
+    group_id = arguments.get("group_id")
+    if group_id is not None and not str(group_id).isdigit():
+        errors.append(f"group_id: must be a numeric string, got {group_id!r}")
+    proxy = arguments.get("proxy_config")
+    if not isinstance(proxy, dict):
+        proxy = {}
+    if proxy.get("proxy_soft") in PROXY_SOFT_WITH_HOST:
+        for field in ("proxy_host", "proxy_port"):
+            if not proxy.get(field):
+                errors.append(f"proxy_config.{field}: required when proxy_soft is {proxy['proxy_soft']!r}")
+    if proxy.get("proxy_soft") == "other" and proxy.get("proxy_type") not in PROXY_TYPES_FOR_OTHER:
+        errors.append(f"proxy_config.proxy_type: must be one of {list(PROXY_TYPES_FOR_OTHER)} when proxy_soft is 'other', got {proxy.get('proxy_type')!r}")
+    port = proxy.get("proxy_port")
+    if port and not (str(port).isdigit() and 0 < int(port) < 65536):
+        errors.append(f"proxy_config.proxy_port: must be a port number from 1 to 65535, got {port!r}")
+    if arguments.get("cookie") and isinstance(arguments["cookie"], (str, list)):
+        errors.extend(f"cookie{'' if error.startswith('[') else ': '}{error}" for error in cookie_errors(arguments["cookie"]))
+    return errors
+
 API_ENDPOINTS = {
     "start_browser": '/api/v1/browser/start',
     "close_browser": '/api/v1/browser/stop',
@@ -69,11 +583,925 @@ API_ENDPOINTS = {
     "move_browser": '/api/v1/user/regroup'
 }
 
+API_METHODS = {
+    "start_browser": "GET",
+    "close_browser": "GET",
+    "get_browser_list": "GET",
+    "get_group_list": "GET",
+    "get_application_list": "GET",
+    "get_opened_browser": "GET",
+}
+
+# 接口分类, 用于按类覆盖限速
+ENDPOINT_CLASSES = {
+    "start_browser": "browser",
+    "close_browser": "browser",
+    "get_opened_browser": "browser",
+    "create_browser": "profile",
+    "get_browser_list": "profile",
+    "update_browser": "profile",
+    "delete_browser": "profile",
+    "move_browser": "profile",
+    "get_group_list": "group",
+    "create_group": "group",
+    "update_group": "group",
+    "get_application_list": "application",
+}
+
+# 调度优先级, 数值越小越先发送; 关闭浏览器可以插队到列表查询之前
+ENDPOINT_PRIORITY = {
+    "close_browser": 0,
+    "start_browser": 1,
+    "create_browser": 2,
+    "update_browser": 2,
+    "delete_browser": 2,
+    "move_browser": 2,
+    "create_group": 2,
+    "update_group": 2,
+}
+DEFAULT_PRIORITY = 3
+
+class TokenBucket:
+    """
+    Token bucket rate limiter that hands out tokens in priority order (lowest value first).
+    """
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._waiters: List[tuple] = []
+        self._seq = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def drain(self) -> None:
+        """
+        Empty the bucket so every class sharing it pauses after the API reports throttling.
+        """
+        self._refill()
+        self._tokens = min(self._tokens, 0.0)
+
+    async def acquire(self, priority: int = DEFAULT_PRIORITY) -> None:
+        if self.rate <= 0:
+            return
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), waiter))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await waiter
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+            waiter = heapq.heappop(self._waiters)[2]
+            if not waiter.done():
+                self._tokens -= 1
+                waiter.set_result(None)
+
+# 所有接口类默认共享同一个令牌桶, 优先级才能在类之间生效 (如关闭浏览器排在列表查询之前);
+# 只有设置了 ADSPOWER_RATE_LIMIT_<CLASS> 的类使用独立的令牌桶
+_shared_limiter = TokenBucket(RATE_LIMIT, RATE_BURST)
+RATE_LIMITERS = {
+    cls: TokenBucket(float(os.environ[f"ADSPOWER_RATE_LIMIT_{cls.upper()}"]), RATE_BURST)
+    if f"ADSPOWER_RATE_LIMIT_{cls.upper()}" in os.environ else _shared_limiter
+    for cls in set(ENDPOINT_CLASSES.values())
+}
+
+def is_throttled(data: Dict[str, Any]) -> bool:
+    """
+    Whether a decoded response is the Local API's "too many requests" rejection.
+    """
+    return data.get("code") != 0 and "too many request" in str(data.get("msg", "")).lower()
+
+# 可缓存的只读接口, 以及写接口成功后需要失效的缓存
+CACHED_ENDPOINTS = {"get_group_list", "get_application_list", "get_browser_list"}
+CACHE_INVALIDATION = {
+    "create_group": ("get_group_list",),
+    "update_group": ("get_group_list", "get_browser_list"),
+    "create_browser": ("get_browser_list",),
+    "update_browser": ("get_browser_list",),
+    "delete_browser": ("get_browser_list",),
+    "move_browser": ("get_browser_list",),
+}
+
+# 只读接口: 相同参数的并发请求合并为一次上游调用
+READ_ENDPOINTS = CACHED_ENDPOINTS | {"get_opened_browser"}
+
+class TTLCache:
+    """
+    LRU cache of decoded responses keyed on (endpoint, params), whose entries also expire after `ttl` seconds.
+
+    Each endpoint has a generation counter bumped on invalidation, so a read that was in flight
+    while a write completed does not store its now-stale result.
+    """
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: collections.OrderedDict = collections.OrderedDict()
+        self._generations: Dict[str, int] = collections.defaultdict(int)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(endpoint: str, params: Dict[str, Any] = None) -> tuple:
+        return endpoint, json.dumps(params or {}, sort_keys=True, default=str)
+
+    def generation(self, endpoint: str) -> int:
+        return self._generations[endpoint]
+
+    def get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: tuple, value: Dict[str, Any], generation: int) -> None:
+        if self.ttl <= 0 or generation != self._generations[key[0]]:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, endpoint: str) -> None:
+        self._generations[endpoint] += 1
+        for key in [key for key in self._entries if key[0] == endpoint]:
+            del self._entries[key]
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+api_cache = TTLCache(CACHE_MAX_ENTRIES, CACHE_TTL)
+
+async def request_api(endpoint: str, params: Dict[str, Any] = None, json: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Send a request to a Local API endpoint over the shared client.
+
+    Successful reads of CACHED_ENDPOINTS are served from api_cache until they expire, and
+    write endpoints invalidate the cached reads listed in CACHE_INVALIDATION. Identical
+    concurrent reads of READ_ENDPOINTS share one upstream call. Callers must treat the returned
+    dict as read-only, since it may be shared through the cache or with other callers. Fresh
+    profile lists and successful profile writes are also applied to profile_index, and
+    successful starts and closes to browser_tracker.
+
+    Returns the decoded body; a non-200 response is folded into {"code": -1, "msg": <response text>}
+    so callers only need to check data["code"].
+    """
+    if endpoint in READ_ENDPOINTS:
+        key = TTLCache.key(endpoint, params)
+        data = api_cache.get(key) if endpoint in CACHED_ENDPOINTS else None
+        if data is None:
+            data = await _read_once(endpoint, params, key)
+        return data
+    try:
+        data = await _send_request(endpoint, params, json)
+    finally:
+        for cached_endpoint in CACHE_INVALIDATION.get(endpoint, ()):
+            api_cache.invalidate(cached_endpoint)
+    if data["code"] == 0:
+        request = json if json is not None else params
+        profile_index.observe(endpoint, request, data)
+        browser_tracker.observe(endpoint, request, data)
+    return data
+
+_inflight_reads: Dict[tuple, asyncio.Task] = {}
+
+async def _read_once(endpoint: str, params: Dict[str, Any], key: tuple) -> Dict[str, Any]:
+    """
+    Send a read, or join the identical read already in flight.
+
+    Reads are keyed on (endpoint, params) and the endpoint's cache generation, so a read issued
+    after a write never joins one sent before it. The shared request runs as its own task and
+    caches its result once; a caller being cancelled does not cancel it for the others.
+    """
+    generation = api_cache.generation(endpoint)
+    flight_key = (*key, generation)
+    task = _inflight_reads.get(flight_key)
+    if task is not None:
+        metrics.inc("adspower_api_coalesced_total", endpoint=endpoint)
+        return await asyncio.shield(task)
+
+    async def fetch() -> Dict[str, Any]:
+        data = await _send_request(endpoint, params)
+        if data["code"] == 0 and endpoint in CACHED_ENDPOINTS:
+            api_cache.set(key, data, generation)
+            profile_index.observe(endpoint, params, data)
+        return data
+
+    task = _inflight_reads[flight_key] = asyncio.create_task(fetch())
+    task.add_done_callback(lambda _: _inflight_reads.pop(flight_key, None))
+    return await asyncio.shield(task)
+
+async def _send_request(endpoint: str, params: Dict[str, Any] = None, json: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Send one request, bypassing the cache.
+
+    Requests wait for a token from their endpoint class's rate limiter (shared by all classes
+    unless overridden), in ENDPOINT_PRIORITY order, and throttled responses are retried with jittered exponential backoff.
+    """
+    method = API_METHODS.get(endpoint, "POST")
+    limiter = RATE_LIMITERS[ENDPOINT_CLASSES[endpoint]]
+    priority = ENDPOINT_PRIORITY.get(endpoint, DEFAULT_PRIORITY)
+    for attempt in itertools.count():
+        queued = time.perf_counter()
+        await limiter.acquire(priority)
+        sent = time.perf_counter()
+        with metrics.in_flight("adspower_api_in_flight", endpoint=endpoint):
+            response = await get_http_client().request(method, API_ENDPOINTS[endpoint], params=params, json=json)
+        received = time.perf_counter()
+        if response.status_code == 429:
+            data = {"code": -1, "msg": f"Too many requests: {response.text}"}
+        elif response.status_code != 200:
+            data = {"code": -1, "msg": response.text}
+        else:
+            data = response.json()
+        decoded = time.perf_counter()
+        record_api_call(endpoint, attempt, queued, sent, received, decoded, response, data)
+        if attempt >= THROTTLE_MAX_RETRIES or not is_throttled(data):
+            return data
+        metrics.inc("adspower_api_retries_total", endpoint=endpoint)
+        limiter.drain()
+        delay = min(THROTTLE_BACKOFF_MAX, THROTTLE_BACKOFF * 2 ** attempt)
+        await asyncio.sleep(random.uniform(delay / 2, delay))
+
+def record_api_call(endpoint: str, attempt: int, queued: float, sent: float, received: float, decoded: float,
+                    response: httpx.Response, data: Dict[str, Any]) -> None:
+    metrics.observe("adspower_api_queue_seconds", sent - queued, endpoint=endpoint)
+    metrics.observe("adspower_api_duration_seconds", received - sent, endpoint=endpoint)
+    metrics.observe("adspower_api_decode_seconds", decoded - received, endpoint=endpoint)
+    metrics.inc("adspower_api_request_bytes_total", len(response.request.content), endpoint=endpoint)
+    metrics.inc("adspower_api_response_bytes_total", len(response.content), endpoint=endpoint)
+    if data.get("code") != 0:
+        metrics.inc("adspower_api_errors_total", endpoint=endpoint, msg=str(data.get("msg"))[:100])
+    trace({
+        "kind": "api",
+        "endpoint": endpoint,
+        "attempt": attempt,
+        "queue_ms": round((sent - queued) * 1000, 3),
+        "upstream_ms": round((received - sent) * 1000, 3),
+        "decode_ms": round((decoded - received) * 1000, 3),
+        "status": response.status_code,
+        "code": data.get("code"),
+        "bytes": len(response.content),
+    })
+
+class LocalApiError(Exception):
+    """
+    Raised by helpers that cannot return a {"code", "msg"} dict when the Local API reports an error.
+    """
+
+async def iter_pages(
+    endpoint: str,
+    params: Dict[str, Any] = None,
+    page_size: int = LIST_PAGE_SIZE,
+    start_page: int = 1,
+    window: int = 1,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield the `list` of each page of a paginated endpoint, in page order.
+
+    Up to `window` page requests are kept in flight ahead of the consumer, so the next page is
+    already being fetched while the current one is processed. Iteration stops after the first
+    short page.
+    """
+    def fetch(page: int) -> asyncio.Task:
+        page_params = {**(params or {}), "page": str(page), "page_size": str(page_size)}
+        return asyncio.create_task(request_api(endpoint, params=page_params))
+
+    inflight = collections.deque(fetch(start_page + i) for i in range(max(window, 1)))
+    next_page = start_page + len(inflight)
+    try:
+        while inflight:
+            data = await inflight.popleft()
+            if data["code"] != 0:
+                raise LocalApiError(data["msg"])
+            items = data["data"]["list"]
+            if len(items) < page_size:
+                yield items
+                return
+            inflight.append(fetch(next_page))
+            next_page += 1
+            yield items
+    finally:
+        for task in inflight:
+            task.cancel()
+
+# 列表工具的输出格式: text 为原有的 Python repr 格式
+ListFormat = Literal["text", "json", "tsv"]
+
+def pluck(row: Dict[str, Any], field: str) -> Any:
+    """
+    Read a field from a row; dotted names such as "user_proxy_config.proxy_host" reach into nested dicts.
+    """
+    value = row
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+class ListRenderer:
+    """
+    Incrementally render list rows as text (Python repr), compact JSON or TSV.
+
+    Rows are written to the output buffer as each page is fed in, optionally projected to the
+    requested fields, so callers can drop a page as soon as it has been rendered. TSV columns
+    are the requested fields, or the keys of the first row.
+    """
+    def __init__(self, format: ListFormat = "text", fields: List[str] = None):
+        self.format = format
+        self.fields = fields or None
+        self.count = 0
+        self._out = io.StringIO()
+
+    def feed(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            if self.fields:
+                row = {field: pluck(row, field) for field in self.fields}
+            if self.format == "tsv":
+                if self.count == 0:
+                    self.fields = self.fields or list(row)
+                    self._out.write("\t".join(self.fields))
+                self._out.write("\n")
+                self._out.write("\t".join(self._tsv_cell(row.get(field)) for field in self.fields))
+            elif self.format == "json":
+                self._out.write("[" if self.count == 0 else ",")
+                self._out.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")))
+            else:
+                self._out.write("[" if self.count == 0 else ", ")
+                self._out.write(repr(row))
+            self.count += 1
+
+    @staticmethod
+    def _tsv_cell(value: Any) -> str:
+        if value is None:
+            return ""
+        if not isinstance(value, str):
+            value = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+    def getvalue(self) -> str:
+        if self.format == "tsv":
+            return self._out.getvalue()
+        return self._out.getvalue() + "]" if self.count else "[]"
+
+def render_list(rows: List[Dict[str, Any]], format: ListFormat = "text", fields: List[str] = None) -> str:
+    renderer = ListRenderer(format, fields)
+    renderer.feed(rows)
+    return renderer.getvalue()
+
+# 索引中的可搜索列及其在浏览器信息中的字段
+INDEX_COLUMNS = {
+    "serial_number": "serial_number",
+    "name": "name",
+    "group_id": "group_id",
+    "group_name": "group_name",
+    "domain_name": "domain_name",
+    "remark": "remark",
+    "ip": "ip",
+    "ip_country": "ip_country",
+    "proxy_soft": "user_proxy_config.proxy_soft",
+    "proxy_type": "user_proxy_config.proxy_type",
+    "proxy_host": "user_proxy_config.proxy_host",
+    "proxy_port": "user_proxy_config.proxy_port",
+}
+
+class ProfileIndex:
+    """
+    SQLite index of profile metadata for searches the Local API cannot filter on.
+
+    The index is filled by a full paginated pull of /api/v1/user/list and then kept current
+    from the responses of create, update, delete and move calls and of any profile list read.
+    Every row keeps the full profile JSON, so fields without a column (e.g. fingerprint
+    settings) are still searchable through json_extract.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            columns = ", ".join(f"{column} TEXT" for column in INDEX_COLUMNS)
+            self._db.executescript(f"""
+                CREATE TABLE IF NOT EXISTS profiles (user_id TEXT PRIMARY KEY, {columns}, raw TEXT NOT NULL, sync_gen INTEGER NOT NULL);
+                CREATE INDEX IF NOT EXISTS profiles_name ON profiles (name);
+                CREATE INDEX IF NOT EXISTS profiles_group_id ON profiles (group_id);
+                CREATE INDEX IF NOT EXISTS profiles_proxy_host ON profiles (proxy_host);
+                CREATE INDEX IF NOT EXISTS profiles_serial_number ON profiles (serial_number);
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """)
+        return self._db
+
+    def _meta(self, key: str, default: Any = None) -> Any:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    @property
+    def built_at(self) -> Optional[float]:
+        return self._meta("built_at")
+
+    def upsert(self, profiles: List[Dict[str, Any]]) -> None:
+        sync_gen = self._meta("sync_gen", 0)
+        rows = []
+        for profile in profiles:
+            values = [pluck(profile, field) for field in INDEX_COLUMNS.values()]
+            values = [None if value is None else str(value) for value in values]
+            rows.append((profile["user_id"], *values, json.dumps(profile, ensure_ascii=False), sync_gen))
+        placeholders = ", ".join("?" * (len(INDEX_COLUMNS) + 3))
+        with self.db:
+            self.db.executemany(f"INSERT OR REPLACE INTO profiles VALUES ({placeholders})", rows)
+
+    def patch(self, user_ids: List[str], changes: Dict[str, Any]) -> None:
+        """
+        Merge changed fields into already-indexed profiles; unknown profiles are left for the next rebuild.
+        """
+        if not user_ids:
+            return
+        marks = ", ".join("?" * len(user_ids))
+        rows = self.db.execute(f"SELECT raw FROM profiles WHERE user_id IN ({marks})", user_ids).fetchall()
+        self.upsert([{**json.loads(raw), **changes} for (raw,) in rows])
+
+    def delete(self, user_ids: List[str]) -> None:
+        with self.db:
+            self.db.executemany("DELETE FROM profiles WHERE user_id = ?", [(user_id,) for user_id in user_ids])
+
+    def observe(self, endpoint: str, request: Dict[str, Any], data: Dict[str, Any]) -> None:
+        """
+        Apply a successful Local API response to the index. Does nothing until the index has been
+        opened, unless it lives on disk and must not miss writes between sessions. Profile list
+        pages read by a running rebuild are left to it. If the update fails the index is marked
+        stale so the next search rebuilds it.
+        """
+        if self._db is None and self.path == ":memory:":
+            return
+        request = request or {}
+        try:
+            if endpoint == "get_browser_list":
+                # 重建期间每一页由 rebuild 自己写入, 不重复写
+                if not self._lock.locked():
+                    self.upsert(data["data"]["list"])
+            elif endpoint == "create_browser":
+                self.upsert([{**request, "user_id": data["data"]["id"], "serial_number": data["data"].get("serial_number")}])
+            elif endpoint == "update_browser":
+                changes = {key: value for key, value in request.items() if key != "user_id"}
+                if "group_id" in changes:
+                    changes["group_name"] = None
+                self.patch([request["user_id"]], changes)
+            elif endpoint == "delete_browser":
+                self.delete(request["user_ids"])
+            elif endpoint == "move_browser":
+                self.patch(request["user_ids"], {"group_id": request["group_id"], "group_name": None})
+        except (sqlite3.Error, KeyError):
+            with self.db:
+                self.db.execute("DELETE FROM meta WHERE key = 'built_at'")
+
+    async def rebuild(self, ctx: Context = None, max_age: float = None) -> None:
+        """
+        Re-pull every profile and drop indexed profiles that no longer exist. With `max_age`, skip
+        the pull if the index was built more recently than that; without it, the pull bypasses
+        the response cache so changes made outside this server are picked up.
+        """
+        async with self._lock:
+            built_at = self.built_at
+            if max_age is not None and built_at is not None and time.time() - built_at <= max_age:
+                return
+            if max_age is None:
+                api_cache.invalidate("get_browser_list")
+            sync_gen = self._meta("sync_gen", 0) + 1
+            with self.db:
+                self._set_meta("sync_gen", sync_gen)
+            count = 0
+            async for items in iter_pages("get_browser_list", window=LIST_PREFETCH_PAGES):
+                self.upsert(items)
+                count += len(items)
+                if ctx is not None:
+                    await ctx.report_progress(count)
+            with self.db:
+                self.db.execute("DELETE FROM profiles WHERE sync_gen < ?", (sync_gen,))
+                self._set_meta("built_at", time.time())
+
+    def search(self, filters: Dict[str, str], limit: int = None) -> tuple:
+        """
+        Return (total matches, matching profiles up to `limit`). Filter keys are index columns or
+        dotted profile fields; values match exactly unless they contain the wildcards * or ?.
+        """
+        clauses, args = [], []
+        for field, pattern in filters.items():
+            if field in INDEX_COLUMNS or field == "user_id":
+                expr = field
+            else:
+                expr = "json_extract(raw, ?)"
+                args.append("$." + field)
+            if "*" in pattern or "?" in pattern:
+                like = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                clauses.append(f"{expr} LIKE ? ESCAPE '\\'")
+                args.append(like.replace("*", "%").replace("?", "_"))
+            else:
+                clauses.append(f"CAST({expr} AS TEXT) = ?")
+                args.append(pattern)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        total = self.db.execute(f"SELECT COUNT(*) FROM profiles {where}", args).fetchone()[0]
+        query = f"SELECT raw FROM profiles {where} ORDER BY CAST(serial_number AS INTEGER) LIMIT ?"
+        rows = self.db.execute(query, [*args, -1 if limit is None else limit]).fetchall()
+        return total, [json.loads(raw) for (raw,) in rows]
+
+profile_index = ProfileIndex(INDEX_PATH)
+
+class BrowserTracker:
+    """
+    In-memory view of the opened browsers, with each one's debug port and websocket endpoints.
+
+    Our own start and close calls update it directly. A background task reconciles it with
+    /api/v1/browser/local-active to catch browsers opened or closed elsewhere, polling every
+    TRACKER_MIN_INTERVAL seconds after a change and backing off to TRACKER_MAX_INTERVAL while
+    nothing changes.
+    """
+    def __init__(self):
+        self._browsers: Dict[str, Dict[str, Any]] = {}
+        self._version = 0
+        self._wake = asyncio.Event()
+        self.synced_at: Optional[float] = None
+
+    @property
+    def browsers(self) -> List[Dict[str, Any]]:
+        return list(self._browsers.values())
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return self._browsers.get(user_id)
+
+    def observe(self, endpoint: str, request: Dict[str, Any], data: Dict[str, Any]) -> None:
+        if endpoint not in ("start_browser", "close_browser"):
+            return
+        self._version += 1
+        user_id = (request or {}).get("user_id")
+        if user_id is None:
+            # Started or closed by serial number: only the Local API knows which user_id it was
+            self._wake.set()
+        elif endpoint == "start_browser":
+            self._browsers[user_id] = {"user_id": user_id, **data["data"]}
+        else:
+            self._browsers.pop(user_id, None)
+
+    def is_fresh(self) -> bool:
+        return self.synced_at is not None and time.monotonic() - self.synced_at <= TRACKER_MAX_INTERVAL
+
+    async def reconcile(self) -> bool:
+        """
+        Replace the view with the Local API's list. Returns whether anything had changed outside this server.
+        """
+        version = self._version
+        data = await request_api("get_opened_browser")
+        if data["code"] != 0:
+            raise LocalApiError(data["msg"])
+        if version != self._version:
+            # A start or close finished while the list was in flight, so the list may predate it
+            self._wake.set()
+            return True
+        browsers = {browser["user_id"]: browser for browser in data["data"]["list"]}
+        changed = browsers.keys() != self._browsers.keys()
+        self._browsers = browsers
+        self.synced_at = time.monotonic()
+        return changed
+
+    async def run(self) -> None:
+        interval = TRACKER_MIN_INTERVAL
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                changed = await self.reconcile()
+            except (httpx.HTTPError, LocalApiError):
+                changed = False
+            interval = TRACKER_MIN_INTERVAL if changed else min(interval * 2, TRACKER_MAX_INTERVAL)
+
+browser_tracker = BrowserTracker()
+
+class BrowserPool:
+    """
+    Warm pool of started browsers that tasks lease and release instead of launching their own.
+
+    POOL_SIZE idle browsers from POOL_GROUP_ID are kept running ahead of demand. Leasing from a
+    group with no idle browser starts one on demand, and released browsers stay open for the next
+    lease. Idle browsers beyond the warm target are closed after POOL_IDLE_TIMEOUT seconds, the pool
+    never holds more than POOL_MAX_OPEN browsers, and browsers the opened-browser tracker no longer
+    sees (closed or crashed outside the pool) are dropped.
+    """
+    def __init__(self, group_id: Optional[str], size: int, max_open: int, idle_timeout: float):
+        self.group_id = group_id
+        self.size = size if group_id else 0
+        self.max_open = max_open
+        self.idle_timeout = idle_timeout
+        self._idle: Dict[str, collections.OrderedDict] = collections.defaultdict(collections.OrderedDict)
+        self._leased: Dict[str, Dict[str, Any]] = {}
+        self._starting: set = set()
+        self._reserved = 0
+        self._wake = asyncio.Event()
+        self.last_error: Optional[str] = None
+
+    @property
+    def open_count(self) -> int:
+        return sum(len(idle) for idle in self._idle.values()) + len(self._leased) + self._reserved
+
+    def _pooled(self) -> set:
+        return set(self._leased) | self._starting | {user_id for idle in self._idle.values() for user_id in idle}
+
+    async def _pick(self, group_id: str) -> Optional[str]:
+        async for items in iter_pages("get_browser_list", {"group_id": group_id}):
+            pooled = self._pooled()
+            for profile in items:
+                if profile["user_id"] not in pooled and browser_tracker.get(profile["user_id"]) is None:
+                    return profile["user_id"]
+        return None
+
+    async def _start(self, group_id: str) -> Dict[str, Any]:
+        """
+        Start a profile of the group that is not open yet and return its pool entry.
+        """
+        if self.open_count >= self.max_open:
+            raise LocalApiError(f"the pool already holds {self.max_open} open browsers")
+        self._reserved += 1
+        try:
+            user_id = await self._pick(group_id)
+            if user_id is None:
+                raise LocalApiError(f"group {group_id} has no profile left to start")
+            self._starting.add(user_id)
+            try:
+                data = await request_api("start_browser", params=build_start_params(browser_id=user_id))
+            finally:
+                self._starting.discard(user_id)
+        finally:
+            self._reserved -= 1
+        if data["code"] != 0:
+            raise LocalApiError(data["msg"])
+        return {"user_id": user_id, "group_id": group_id, "data": data["data"], "since": time.monotonic()}
+
+    async def lease(self, group_id: str = None) -> tuple:
+        """
+        Hand out an idle browser of the group, starting one if none is idle. Returns (entry, warm).
+        """
+        started = time.perf_counter()
+        group_id = group_id or self.group_id
+        idle = self._idle[group_id]
+        entry, warm = None, True
+        while idle and entry is None:
+            user_id, candidate = idle.popitem()
+            if browser_tracker.get(user_id) is not None:
+                entry = candidate
+        if entry is None:
+            entry, warm = await self._start(group_id), False
+        self._leased[entry["user_id"]] = entry
+        self._wake.set()
+        metrics.observe("adspower_pool_lease_seconds", time.perf_counter() - started, warm=str(warm).lower())
+        return entry, warm
+
+    async def release(self, user_id: str, close: bool = False) -> str:
+        """
+        Take a leased browser back. Returns "idle", "closed" or "gone" (no longer open).
+        """
+        entry = self._leased.pop(user_id, None)
+        if entry is None:
+            raise LocalApiError(f"browser {user_id} is not leased from the pool")
+        if browser_tracker.get(user_id) is None:
+            return "gone"
+        if close:
+            data = await request_api("close_browser", params={"user_id": user_id})
+            if data["code"] != 0:
+                raise LocalApiError(data["msg"])
+            return "closed"
+        entry["since"] = time.monotonic()
+        self._idle[entry["group_id"]][user_id] = entry
+        self._wake.set()
+        return "idle"
+
+    async def maintain(self) -> None:
+        """
+        Drop browsers that are no longer open, close idle browsers past the timeout and top the warm group back up.
+        """
+        if self._idle or self._leased:
+            if browser_tracker.synced_at is None or time.monotonic() - browser_tracker.synced_at > POOL_CHECK_INTERVAL:
+                await browser_tracker.reconcile()
+            for user_id in [user_id for user_id in self._leased if browser_tracker.get(user_id) is None]:
+                del self._leased[user_id]
+        now = time.monotonic()
+        expired = []
+        for group_id, idle in self._idle.items():
+            for user_id in [user_id for user_id in idle if browser_tracker.get(user_id) is None]:
+                del idle[user_id]
+            target = self.size if group_id == self.group_id else 0
+            while len(idle) > target and now - next(iter(idle.values()))["since"] > self.idle_timeout:
+                expired.append(idle.popitem(last=False)[0])
+        await asyncio.gather(*(request_api("close_browser", params={"user_id": user_id}) for user_id in expired))
+
+        if self.size:
+            missing = min(self.size - len(self._idle[self.group_id]), self.max_open - self.open_count)
+            entries = await asyncio.gather(*(self._start(self.group_id) for _ in range(max(missing, 0))), return_exceptions=True)
+            for entry in entries:
+                if isinstance(entry, BaseException):
+                    self.last_error = str(entry)
+                else:
+                    self._idle[self.group_id][entry["user_id"]] = entry
+
+    async def run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                await self.maintain()
+            except (httpx.HTTPError, LocalApiError) as e:
+                self.last_error = str(e)
+            try:
+                await asyncio.wait_for(self._wake.wait(), POOL_CHECK_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def close_idle(self) -> None:
+        idle = [user_id for group in self._idle.values() for user_id in group]
+        self._idle.clear()
+        await asyncio.gather(*(request_api("close_browser", params={"user_id": user_id}) for user_id in idle), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "group_id": self.group_id,
+            "size": self.size,
+            "max_open": self.max_open,
+            "idle": {group_id: list(idle) for group_id, idle in self._idle.items() if idle},
+            "leased": list(self._leased),
+            "starting": len(self._starting),
+            "last_error": self.last_error,
+        }
+
+browser_pool = BrowserPool(POOL_GROUP_ID, POOL_SIZE, POOL_MAX_OPEN, POOL_IDLE_TIMEOUT)
+
+async def run_bulk(
+    items: List[Any],
+    worker: Callable[[Any], Awaitable[Dict[str, Any]]],
+    concurrency: int = None,
+    ctx: Context = None,
+    describe: Callable[[Any, Dict[str, Any]], str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run worker(item) for every item with at most `concurrency` calls in flight.
+
+    As each call finishes its outcome is streamed to the client as a log message and a
+    progress notification. Transport errors are recorded as {"code": -1, "msg": ...} so one
+    failing item never aborts the batch. Results are returned in input order.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency or BULK_CONCURRENCY, 1))
+
+    async def run_one(index: int, item: Any) -> tuple:
+        async with semaphore:
+            try:
+                return index, await worker(item)
+            except httpx.HTTPError as e:
+                return index, {"code": -1, "msg": f"{type(e).__name__}: {e}"}
+
+    results: List[Dict[str, Any]] = [None] * len(items)
+    pending = [run_one(index, item) for index, item in enumerate(items)]
+    for done, future in enumerate(asyncio.as_completed(pending), 1):
+        index, data = await future
+        results[index] = data
+        if ctx is not None:
+            status = "ok" if data["code"] == 0 else f"failed: {data['msg']}"
+            await ctx.info(describe(items[index], data) if describe else f"{items[index]}: {status}")
+            await ctx.report_progress(done, len(items))
+    return results
+
+def format_bulk_summary(title: str, rows: List[List[str]], header: List[str]) -> str:
+    """
+    Render bulk results as a compact pipe-separated table under a one-line title.
+    """
+    lines = [title, " | ".join(header)]
+    lines.extend(" | ".join(str(cell) for cell in row) for row in rows)
+    return "\n".join(lines)
+
+async def run_id_batches(
+    endpoint: str,
+    user_ids: List[str],
+    make_body: Callable[[List[str]], Dict[str, Any]],
+    concurrency: int = None,
+    ctx: Context = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Send user_ids to a batch endpoint in chunks of BATCH_SIZE, at most `concurrency` chunks in flight.
+
+    The Local API fails a whole batch with one message that does not name the bad IDs, so a chunk
+    failing with one of PER_ID_ERRORS is split in half and both halves are retried, down to single
+    IDs, until the failing IDs are isolated (about 2·log2(BATCH_SIZE) extra calls per bad ID).
+    Other errors apply to the whole chunk and are not retried. Nor is a chunk whose request failed
+    in transport: the server may have applied it, so its IDs are reported as not confirmed.
+    Progress is reported in IDs done. Returns {user_id: None on success, else the error}, in
+    input order.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency or BULK_CONCURRENCY, 1))
+    results: Dict[str, Optional[str]] = {}
+
+    async def send(chunk: List[str]) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return await request_api(endpoint, json=make_body(chunk))
+            except httpx.HTTPError as e:
+                return {"code": -1, "msg": f"unknown, not confirmed ({type(e).__name__}: {e})"}
+
+    async def settle(chunk: List[str], data: Dict[str, Any]) -> None:
+        if data["code"] != 0 and len(chunk) > 1 and any(error in str(data["msg"]) for error in PER_ID_ERRORS):
+            halves = [chunk[:len(chunk) // 2], chunk[len(chunk) // 2:]]
+            retried = await asyncio.gather(*(send(half) for half in halves))
+            await asyncio.gather(*(settle(half, result) for half, result in zip(halves, retried)))
+            return
+        for user_id in chunk:
+            results[user_id] = None if data["code"] == 0 else data["msg"]
+        if ctx is not None:
+            status = "ok" if data["code"] == 0 else f"failed: {data['msg']}"
+            await ctx.info(f"{len(chunk)} browsers {status}")
+            await ctx.report_progress(len(results), len(user_ids))
+
+    async def run(chunk: List[str]) -> None:
+        await settle(chunk, await send(chunk))
+
+    await asyncio.gather(*(run(user_ids[i:i + BATCH_SIZE]) for i in range(0, len(user_ids), BATCH_SIZE)))
+    return {user_id: results[user_id] for user_id in user_ids}
+
+async def select_browser_ids(browser_ids: List[str] = None, select: Dict[str, str] = None, refresh: bool = True, ctx: Context = None) -> List[str]:
+    """
+    The given browser_ids plus the IDs of all profiles matching `select` in the profile index,
+    without duplicates.
+    """
+    user_ids = list(browser_ids or [])
+    if select:
+        await profile_index.rebuild(ctx, max_age=None if refresh else INDEX_MAX_AGE)
+        _, profiles = profile_index.search(select)
+        user_ids.extend(profile["user_id"] for profile in profiles)
+    return list(dict.fromkeys(user_ids))
+
+async def group_exists(group_id: str) -> bool:
+    """
+    Whether `group_id` is in the group list. Raises LocalApiError if the list cannot be fetched.
+    """
+    async for groups in iter_pages("get_group_list"):
+        if any(str(group.get("group_id")) == str(group_id) for group in groups):
+            return True
+    return False
+
+def format_id_results(verb: str, results: Dict[str, Optional[str]]) -> str:
+    failed = sum(1 for error in results.values() if error is not None)
+    if not failed:
+        return f"Browsers {verb} successfully: {', '.join(results)}"
+    rows = [[user_id, "ok" if error is None else "failed", error or ""] for user_id, error in results.items()]
+    title = f"Failed to process {failed}/{len(results)} browsers ({len(results) - failed} {verb}):"
+    return format_bulk_summary(title, rows, ["browser", "status", "error"])
+
 @mcp.tool()
-def start_browser(browser_id: str = None, serial_number: str = None, ip_tab: str = None, launch_args: str = None, clear_cache_after_closing: bool = None, cdp_mask: str = None) -> str:
+async def start_browser(browser_id: str = None, serial_number: str = None, ip_tab: str = None, launch_args: str = None, clear_cache_after_closing: bool = None, cdp_mask: str = None) -> str:
     """
     Start a browser with the Browser ID or Serial Number. Must provide one of the two.
     """
+    params = build_start_params(browser_id, serial_number, ip_tab, launch_args, clear_cache_after_closing, cdp_mask)
+    data = await request_api("start_browser", params=params)
+    if data["code"] == 0:
+        formatted_data = '\n'.join(f"{key}: {value}" for key, value in data['data'].items())
+        return f"Browser opened successfully with:\n{formatted_data}"
+    return f"Failed to start browser, error: {data['msg']}"
+
+def build_start_params(browser_id: str = None, serial_number: str = None, ip_tab: str = None, launch_args: str = None, clear_cache_after_closing: bool = None, cdp_mask: str = None) -> Dict[str, str]:
     params = {}
     if browser_id:
         params["user_id"] = browser_id
@@ -88,40 +1516,193 @@ def start_browser(browser_id: str = None, serial_number: str = None, ip_tab: str
     if cdp_mask:
         params["cdp_mask"] = cdp_mask
     params["open_tabs"] = "0"
+    return params
+
+@mcp.tool()
+async def close_browser(browser_id: str) -> str:
+    """
+    Close a browser with the Browser ID.
+    """
+    data = await request_api("close_browser", params={"user_id": browser_id})
+    if data["code"] == 0:
+        return f"Browser {browser_id} closed successfully"
+    return f"Failed to close browser {browser_id}, error: {data['msg']}"
+
+def _bulk_targets(browser_ids: List[str] = None, serial_numbers: List[str] = None) -> List[tuple]:
+    return [("user_id", i) for i in browser_ids or []] + [("serial_number", s) for s in serial_numbers or []]
+
+@mcp.tool()
+async def start_browsers(
+    browser_ids: List[str] = None,
+    serial_numbers: List[str] = None,
+    launch_args: str = None,
+    clear_cache_after_closing: bool = None,
+    cdp_mask: str = None,
+    concurrency: int = None,
+    ctx: Context = None
+) -> str:
+    """
+    Start many browsers at once by Browser ID and/or Serial Number.
 
-    response = httpx.get(f"{LOCAL_API_BASE}{API_ENDPOINTS['start_browser']}", params=params)
-    if response.status_code == 200:
-        data = response.json()
+    Each result is streamed back as soon as that browser finishes starting, then a summary table is returned.
+
+    Args:
+        browser_ids (List[str], optional): Browser IDs to start
+        serial_numbers (List[str], optional): Serial numbers to start
+        launch_args (str, optional): Launch arguments applied to every browser
+        clear_cache_after_closing (bool, optional): Clear cache after the browsers are closed
+        cdp_mask (str, optional): CDP mask setting applied to every browser
+        concurrency (int, optional): Maximum number of browsers starting at the same time, default is 5
+    """
+    targets = _bulk_targets(browser_ids, serial_numbers)
+    if not targets:
+        return "Failed to start browsers, error: no browser_ids or serial_numbers given"
+
+    async def start(target: tuple) -> Dict[str, Any]:
+        key, value = target
+        params = build_start_params(
+            browser_id=value if key == "user_id" else None,
+            serial_number=value if key == "serial_number" else None,
+            launch_args=launch_args,
+            clear_cache_after_closing=clear_cache_after_closing,
+            cdp_mask=cdp_mask,
+        )
+        return await request_api("start_browser", params=params)
+
+    def describe(target: tuple, data: Dict[str, Any]) -> str:
+        if data["code"] == 0:
+            return f"Browser {target[1]} started, ws: {data['data'].get('ws', {}).get('puppeteer')}"
+        return f"Browser {target[1]} failed to start, error: {data['msg']}"
+
+    results = await run_bulk(targets, start, concurrency, ctx, describe)
+    rows = []
+    for (_, value), data in zip(targets, results):
         if data["code"] == 0:
-            formatted_data = '\n'.join(f"{key}: {value}" for key, value in data['data'].items())
-            return f"Browser opened successfully with:\n{formatted_data}"
+            rows.append([value, "ok", data["data"].get("debug_port", ""), data["data"].get("ws", {}).get("puppeteer", "")])
         else:
-            return f"Failed to start browser, error: {data['msg']}"
-    else:
-        return f"Failed to start browser, error: {response.text}"
+            rows.append([value, "failed", "", data["msg"]])
+    started = sum(1 for data in results if data["code"] == 0)
+    return format_bulk_summary(f"Started {started}/{len(targets)} browsers:", rows, ["browser", "status", "debug_port", "ws / error"])
 
 @mcp.tool()
-def close_browser(browser_id: str) -> str:
+async def close_browsers(browser_ids: List[str] = None, serial_numbers: List[str] = None, concurrency: int = None, ctx: Context = None) -> str:
     """
-    Close a browser with the Browser ID.
+    Close many browsers at once by Browser ID and/or Serial Number.
+
+    Each result is streamed back as soon as that browser is closed, then a summary table is returned.
+
+    Args:
+        browser_ids (List[str], optional): Browser IDs to close
+        serial_numbers (List[str], optional): Serial numbers to close
+        concurrency (int, optional): Maximum number of browsers closing at the same time, default is 5
     """
-    response = httpx.get(f"{LOCAL_API_BASE}{API_ENDPOINTS['close_browser']}", params={"user_id": browser_id})
-    if response.status_code == 200:
-        data = response.json()
+    targets = _bulk_targets(browser_ids, serial_numbers)
+    if not targets:
+        return "Failed to close browsers, error: no browser_ids or serial_numbers given"
+
+    async def close(target: tuple) -> Dict[str, Any]:
+        return await request_api("close_browser", params={target[0]: target[1]})
+
+    def describe(target: tuple, data: Dict[str, Any]) -> str:
         if data["code"] == 0:
-            return f"Browser {browser_id} closed successfully"
-        else:
-            return f"Failed to close browser {browser_id}, error: {data['msg']}"
-    else:
-        return f"Failed to close browser {browser_id}, error: {response.text}"
+            return f"Browser {target[1]} closed"
+        return f"Browser {target[1]} failed to close, error: {data['msg']}"
+
+    results = await run_bulk(targets, close, concurrency, ctx, describe)
+    rows = [[value, "ok" if data["code"] == 0 else "failed", "" if data["code"] == 0 else data["msg"]]
+            for (_, value), data in zip(targets, results)]
+    closed = sum(1 for data in results if data["code"] == 0)
+    return format_bulk_summary(f"Closed {closed}/{len(targets)} browsers:", rows, ["browser", "status", "error"])
 
 @mcp.tool()
-def create_browser(
+async def lease_browser(group_id: str = None) -> str:
+    """
+    Lease an already running browser from the warm pool and get its debug port and websocket endpoints immediately.
+
+    Release it with release_browser when the task is done so the next task can reuse it.
+
+    Args:
+        group_id (str, optional): Group to lease a browser from, default is the pool's group (ADSPOWER_POOL_GROUP_ID)
+    """
+    if not group_id and not browser_pool.group_id:
+        return "Failed to lease browser, error: no group_id given and ADSPOWER_POOL_GROUP_ID is not set"
+    try:
+        entry, warm = await browser_pool.lease(group_id)
+    except LocalApiError as e:
+        return f"Failed to lease browser, error: {e}"
+    formatted_data = '\n'.join(f"{key}: {value}" for key, value in entry["data"].items())
+    return f"Browser {entry['user_id']} leased ({'warm' if warm else 'cold start'}) with:\n{formatted_data}"
+
+@mcp.tool()
+async def release_browser(browser_id: str, close: bool = False) -> str:
+    """
+    Return a leased browser to the warm pool.
+
+    Args:
+        browser_id (str): Browser ID returned by lease_browser
+        close (bool, optional): Close the browser instead of keeping it open for the next lease
+    """
+    try:
+        status = await browser_pool.release(browser_id, close)
+    except LocalApiError as e:
+        return f"Failed to release browser {browser_id}, error: {e}"
+    if status == "idle":
+        return f"Browser {browser_id} returned to the pool"
+    if status == "closed":
+        return f"Browser {browser_id} released and closed"
+    return f"Browser {browser_id} released, it was no longer open"
+
+def build_profile_body(
+    request_body: Dict[str, Any],
+    proxy_config: Optional[ProxyConfig] = None,
+    domain_name: str = None,
+    open_urls: List[str] = None,
+    cookie: Cookie = None,
+    username: str = None,
+    password: str = None,
+    group_id: str = None,
+    name: str = None,
+    country: str = None,
+    sys_app_cate_id: str = None,
+    fingerprint_config: Optional[FingerprintConfig] = None,
+    storage_strategy: int = None
+) -> Dict[str, Any]:
+    """
+    Add the create/update profile arguments that were given to request_body.
+    """
+    if domain_name:
+        request_body["domain_name"] = domain_name
+    if open_urls:
+        request_body["open_urls"] = open_urls
+    if cookie:
+        request_body["cookie"] = cookie if isinstance(cookie, str) else json.dumps(cookie, ensure_ascii=False)
+    if username:
+        request_body["username"] = username
+    if password:
+        request_body["password"] = password
+    if group_id:
+        request_body["group_id"] = group_id
+    if name:
+        request_body["name"] = name
+    if country:
+        request_body["country"] = country
+    if sys_app_cate_id:
+        request_body["sys_app_cate_id"] = sys_app_cate_id
+    if proxy_config:
+        request_body["user_proxy_config"] = proxy_config
+    if fingerprint_config:
+        request_body["fingerprint_config"] = fingerprint_config
+    if storage_strategy is not None:
+        request_body["storage_strategy"] = storage_strategy
+    return request_body
+
+@mcp.tool()
+async def create_browser(
     group_id: str,
     proxy_config: ProxyConfig,
     domain_name: str = None,
     open_urls: List[str] = None,
-    cookie: str = None,
+    cookie: Cookie = None,
     username: str = None,
     password: str = None,
     name: str = None,
@@ -146,7 +1727,7 @@ def create_browser(
             - global_config: "0" or "1", default is "0"
         domain_name (str, optional): The domain name of the browser, e.g., facebook.com
         open_urls (List[str], optional): The open urls of the browser, e.g., ["https://www.google.com"]
-        cookie (str, optional): The cookie of the browser, e.g., '[{"domain":".baidu.com","expirationDate":"","name":"","path":"/","sameSite":"unspecified","secure":true,"value":"","id":1}]'
+        cookie (List[Dict] or str, optional): The cookie of the browser as a JSON array (or its string form) or Netscape cookies.txt text, e.g., [{"domain":".baidu.com","expirationDate":"","name":"","path":"/","sameSite":"unspecified","secure":true,"value":"","id":1}]
         username (str, optional): The username of the browser, e.g., "user"
         password (str, optional): The password of the browser, e.g., "password"
         name (str, optional): The name of the browser, e.g., "My Browser"
@@ -174,48 +1755,37 @@ def create_browser(
             - tls: TLS configuration string
         storage_strategy (int, optional): The storage strategy of the browser, default is 0
     """
-    request_body = {"group_id": group_id}
-    if domain_name:
-        request_body["domain_name"] = domain_name
-    if open_urls:
-        request_body["open_urls"] = open_urls
-    if cookie:
-        request_body["cookie"] = cookie
-    if username:
-        request_body["username"] = username
-    if password:
-        request_body["password"] = password
-    if name:
-        request_body["name"] = name
-    if country:
-        request_body["country"] = country
-    if sys_app_cate_id:
-        request_body["sys_app_cate_id"] = sys_app_cate_id
-    if proxy_config:
-        request_body["user_proxy_config"] = proxy_config
-    if fingerprint_config:
-        request_body["fingerprint_config"] = fingerprint_config
-    if storage_strategy is not None:
-        request_body["storage_strategy"] = storage_strategy
+    errors = profile_rule_errors({"group_id": group_id, "proxy_config": proxy_config, "cookie": cookie})
+    if errors:
+        return f"Failed to create browser, error: {'; '.join(errors)}"
+    request_body = build_profile_body(
+        {"group_id": group_id},
+        proxy_config=proxy_config,
+        domain_name=domain_name,
+        open_urls=open_urls,
+        cookie=cookie,
+        username=username,
+        password=password,
+        name=name,
+        country=country,
+        sys_app_cate_id=sys_app_cate_id,
+        fingerprint_config=fingerprint_config,
+        storage_strategy=storage_strategy,
+    )
 
-    response = httpx.post(f"{LOCAL_API_BASE}{API_ENDPOINTS['create_browser']}", json=request_body)
-    if response.status_code == 200:
-        data = response.json()
-        if data["code"] == 0:
-            formatted_data = '\n'.join(f"{key}: {value}" for key, value in data['data'].items())
-            return f"Browser created successfully with:\n{formatted_data}"
-        else:
-            return f"Failed to create browser, error: {data['msg']}"
-    else:
-        return f"Failed to create browser, error: {response.text}"
+    data = await request_api("create_browser", json=request_body)
+    if data["code"] == 0:
+        formatted_data = '\n'.join(f"{key}: {value}" for key, value in data['data'].items())
+        return f"Browser created successfully with:\n{formatted_data}"
+    return f"Failed to create browser, error: {data['msg']}"
 
 @mcp.tool()
-def update_browser(
+async def update_browser(
     browser_id: str,
     proxy_config: Optional[ProxyConfig] = None,
     domain_name: str = None,
     open_urls: List[str] = None,
-    cookie: str = None,
+    cookie: Cookie = None,
     username: str = None,
     password: str = None,
     group_id: str = None,
@@ -241,7 +1811,7 @@ def update_browser(
             - global_config: "0" or "1", default is "0"
         domain_name (str, optional): The domain name of the browser, e.g., facebook.com
         open_urls (List[str], optional): The open urls of the browser, e.g., ["https://www.google.com"]
-        cookie (str, optional): The cookie of the browser, e.g., '[{"domain":".baidu.com","expirationDate":"","name":"","path":"/","sameSite":"unspecified","secure":true,"value":"","id":1}]'
+        cookie (List[Dict] or str, optional): The cookie of the browser as a JSON array (or its string form) or Netscape cookies.txt text, e.g., [{"domain":".baidu.com","expirationDate":"","name":"","path":"/","sameSite":"unspecified","secure":true,"value":"","id":1}]
         username (str, optional): The username of the browser, e.g., "user"
         password (str, optional): The password of the browser, e.g., "password"
         group_id (str, optional): The group id of the browser, must be a numeric string (e.g., "123")
@@ -270,62 +1840,534 @@ def update_browser(
             - tls: TLS configuration string
         storage_strategy (int, optional): The storage strategy of the browser, default is 0
     """
-    request_body = {"user_id": browser_id}
-    if domain_name:
-        request_body["domain_name"] = domain_name
-    if open_urls:
-        request_body["open_urls"] = open_urls
-    if cookie:
-        request_body["cookie"] = cookie
-    if username:
-        request_body["username"] = username
-    if password:
-        request_body["password"] = password
-    if group_id:
-        request_body["group_id"] = group_id
-    if name:
-        request_body["name"] = name
-    if country:
-        request_body["country"] = country
-    if sys_app_cate_id:
-        request_body["sys_app_cate_id"] = sys_app_cate_id
-    if proxy_config:
-        request_body["user_proxy_config"] = proxy_config
-    if fingerprint_config:
-        request_body["fingerprint_config"] = fingerprint_config
-    if storage_strategy is not None:
-        request_body["storage_strategy"] = storage_strategy
+    errors = profile_rule_errors({"group_id": group_id, "proxy_config": proxy_config, "cookie": cookie})
+    if errors:
+        return f"Failed to update browser, error: {'; '.join(errors)}"
+    request_body = build_profile_body(
+        {"user_id": browser_id},
+        proxy_config=proxy_config,
+        domain_name=domain_name,
+        open_urls=open_urls,
+        cookie=cookie,
+        username=username,
+        password=password,
+        group_id=group_id,
+        name=name,
+        country=country,
+        sys_app_cate_id=sys_app_cate_id,
+        fingerprint_config=fingerprint_config,
+        storage_strategy=storage_strategy,
+    )
+
+    data = await request_api("update_browser", json=request_body)
+    if data["code"] == 0:
+        formatted_data = '\n'.join(f"{key}: {value}" for key, value in data['data'].items())
+        return f"Browser updated successfully with:\n{formatted_data}"
+    return f"Failed to update browser, error: {data['msg']}"
+
+def load_profile_specs(profiles: List[Dict[str, Any]] = None, file_path: str = None) -> List[Any]:
+    """
+    Collect batch specs from a list and/or a JSONL file. Lines that are not JSON objects are kept
+    as error strings so validation can report them with their line number.
+    """
+    specs: List[Any] = list(profiles or [])
+    if file_path:
+        with open(file_path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    spec = json.loads(line)
+                except ValueError as e:
+                    spec = f"line {line_number}: invalid JSON: {e}"
+                specs.append(spec if isinstance(spec, (dict, str)) else f"line {line_number}: not a JSON object")
+    return specs
+
+@functools.lru_cache(maxsize=None)
+def tool_arg_model(tool: Callable[..., Any]) -> Any:
+    """
+    The tool's pydantic argument model, compiled on first use.
+    """
+    return func_metadata(tool).arg_model
+
+def validate_profile_specs(tool: Callable[..., Any], specs: List[Any]) -> tuple:
+    """
+    Validate every spec against the tool's own argument model (ProxyConfig, FingerprintConfig, ...)
+    and profile_rule_errors, so a batch accepts exactly what the single-profile tool accepts.
+    Rule errors are reported for invalid specs too, so one pass lists every problem.
+    Returns (arguments, errors).
+    """
+    arg_model = tool_arg_model(tool)
+    arguments, errors = [], []
+    for index, spec in enumerate(specs):
+        if isinstance(spec, str):
+            errors.append(f"item {index}: {spec}")
+            continue
+        unknown = set(spec) - set(arg_model.model_fields)
+        if unknown:
+            errors.append(f"item {index}: unknown fields {sorted(unknown)}")
+        try:
+            args = arg_model.model_validate(spec).model_dump_one_level()
+        except ValidationError as e:
+            errors.extend(f"item {index}: {'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+            # 类型错误之外, 规则检查的错误也一并报告, 与类型错误位于同一路径的不重复报告
+            typed = ['.'.join(map(str, error['loc'])) for error in e.errors()]
+            errors.extend(f"item {index}: {error}" for error in profile_rule_errors(spec)
+                          if not any(paths_overlap(error.split(":")[0], path) for path in typed))
+            continue
+        errors.extend(f"item {index}: {error}" for error in profile_rule_errors(args))
+        arguments.append(args)
+    return arguments, errors
+
+def paths_overlap(a: str, b: str) -> bool:
+    """
+    Whether one error path ("proxy_config.proxy_port", "cookie[0].name") is the other or inside it.
+    """
+    a, b = sorted((a, b), key=len)
+    return b == a or b.startswith((a + ".", a + "["))
+
+def format_validation_errors(errors: List[str], limit: int = 50) -> str:
+    return "\n".join(errors[:limit]) + (f"\n... {len(errors) - limit} more" if len(errors) > limit else "")
+
+def spec_hash(spec: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()
+
+def load_manifest(manifest_path: str) -> Dict[int, Dict[str, Any]]:
+    """
+    Read a batch result manifest (JSONL, one line per finished item); later lines win.
+
+    An interrupted run can leave a truncated last line, so lines that cannot be parsed are
+    skipped and their items count as not done.
+    """
+    entries = {}
+    if manifest_path and os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8", errors="replace") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    entries[int(entry["index"])] = entry
+                except (ValueError, KeyError, TypeError):
+                    logger.warning("Skipping unreadable line %d of manifest %s", number, manifest_path)
+    return entries
+
+def open_manifest(manifest_path: str, resume: bool) -> io.TextIOWrapper:
+    """
+    Open a manifest for writing; on resume, append after a newline so a truncated last line
+    does not swallow the first new entry.
+    """
+    unterminated = False
+    if resume and os.path.exists(manifest_path):
+        with open(manifest_path, "rb") as f:
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                unterminated = f.read(1) != b"\n"
+    manifest = open(manifest_path, "a" if resume else "w", encoding="utf-8")
+    if unterminated:
+        manifest.write("\n")
+    return manifest
+
+async def run_profile_batch(
+    action: str,
+    tool: Callable[..., Any],
+    endpoint: str,
+    to_body: Callable[[Dict[str, Any]], Dict[str, Any]],
+    result_id: Callable[[Dict[str, Any], Dict[str, Any]], str],
+    profiles: List[Dict[str, Any]] = None,
+    file_path: str = None,
+    manifest_path: str = None,
+    resume: bool = False,
+    concurrency: int = None,
+    ctx: Context = None,
+) -> str:
+    """
+    Validate every spec, then send the pending ones concurrently, appending each outcome to the manifest.
+    """
+    try:
+        specs = load_profile_specs(profiles, file_path)
+    except OSError as e:
+        return f"Failed to {action} browsers, error: {e}"
+    if not specs:
+        return f"Failed to {action} browsers, error: no profiles or file_path given"
+    arguments, errors = validate_profile_specs(tool, specs)
+    if errors:
+        return f"Failed to {action} browsers, {len(errors)} validation errors, nothing was sent:\n{format_validation_errors(errors)}"
+
+    manifest_path = manifest_path or (f"{file_path}.manifest.jsonl" if file_path else None)
+    hashes = [spec_hash(spec) for spec in specs]
+    done = load_manifest(manifest_path) if resume else {}
+    pending = [index for index in range(len(specs))
+               if not (done.get(index, {}).get("status") == "ok" and done[index].get("spec_hash") == hashes[index])]
+    manifest = open_manifest(manifest_path, resume) if manifest_path else None
 
-    response = httpx.post(f"{LOCAL_API_BASE}{API_ENDPOINTS['update_browser']}", json=request_body)
-    if response.status_code == 200:
-        data = response.json()
+    async def send(index: int) -> Dict[str, Any]:
+        data = await request_api(endpoint, json=to_body(dict(arguments[index])))
+        entry = {"index": index, "spec_hash": hashes[index], "status": "ok" if data["code"] == 0 else "failed"}
         if data["code"] == 0:
-            formatted_data = '\n'.join(f"{key}: {value}" for key, value in data['data'].items())
-            return f"Browser updated successfully with:\n{formatted_data}"
+            entry["id"] = result_id(arguments[index], data)
         else:
-            return f"Failed to update browser, error: {data['msg']}"
-    else:
-        return f"Failed to update browser, error: {response.text}"
+            entry["error"] = data["msg"]
+        if manifest is not None:
+            manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            manifest.flush()
+        return data
+
+    def describe(index: int, data: Dict[str, Any]) -> str:
+        if data["code"] == 0:
+            return f"Item {index}: {action}d {result_id(arguments[index], data)}"
+        return f"Item {index}: failed to {action}, error: {data['msg']}"
+
+    try:
+        results = await run_bulk(pending, send, concurrency, ctx, describe)
+    finally:
+        if manifest is not None:
+            manifest.close()
+
+    rows = []
+    for index, data in zip(pending, results):
+        if data["code"] == 0 and manifest is None:
+            rows.append([index, "ok", result_id(arguments[index], data)])
+        elif data["code"] != 0:
+            rows.append([index, "failed", data["msg"]])
+    succeeded = sum(1 for data in results if data["code"] == 0)
+    title = f"{action.capitalize()}d {succeeded}/{len(pending)} browsers"
+    if len(pending) < len(specs):
+        title += f" ({len(specs) - len(pending)} already done in a previous run)"
+    if manifest_path:
+        title += f", manifest: {manifest_path}"
+    return format_bulk_summary(title + ":", rows, ["item", "status", "browser_id / error"])
 
 @mcp.tool()
-def delete_browser(browser_ids: List[str]) -> str:
+async def create_browsers(
+    profiles: List[Dict[str, Any]] = None,
+    file_path: str = None,
+    manifest_path: str = None,
+    resume: bool = False,
+    concurrency: int = None,
+    ctx: Context = None
+) -> str:
+    """
+    Create many browser profiles at once.
+
+    Every spec is validated first and nothing is sent if any spec is invalid. Specs take the same fields as create_browser.
+
+    Args:
+        profiles (List[Dict], optional): Profile specs, e.g. [{"group_id": "0", "name": "shop-1", "proxy_config": {...}}]
+        file_path (str, optional): Path of a JSONL file with one profile spec per line
+        manifest_path (str, optional): JSONL file recording the result of every item, default is "<file_path>.manifest.jsonl" when file_path is given
+        resume (bool, optional): Skip items the manifest already records as created, to continue an interrupted run
+        concurrency (int, optional): Maximum number of create requests in flight, default is 5
     """
-    Delete one or more browser profiles.
+    return await run_profile_batch(
+        "create", create_browser, "create_browser",
+        to_body=lambda args: build_profile_body({"group_id": args.pop("group_id")}, **args),
+        result_id=lambda args, data: data["data"]["id"],
+        profiles=profiles, file_path=file_path, manifest_path=manifest_path,
+        resume=resume, concurrency=concurrency, ctx=ctx,
+    )
+
+@mcp.tool()
+async def update_browsers(
+    profiles: List[Dict[str, Any]] = None,
+    file_path: str = None,
+    manifest_path: str = None,
+    resume: bool = False,
+    concurrency: int = None,
+    ctx: Context = None
+) -> str:
     """
-    response = httpx.post(f"{LOCAL_API_BASE}{API_ENDPOINTS['delete_browser']}", json={"user_ids": browser_ids})
-    if response.status_code == 200:
-        data = response.json()
-        if data["code"] == 0:
-            return f"Browsers deleted successfully: {', '.join(browser_ids)}"
-        else:
-            return f"Failed to delete browsers, error: {data['msg']}"
-    else:
-        return f"Failed to delete browsers, error: {response.text}"
+    Update many browser profiles at once.
+
+    Every spec is validated first and nothing is sent if any spec is invalid. Specs take the same fields as update_browser, including browser_id.
+
+    Args:
+        profiles (List[Dict], optional): Profile specs, e.g. [{"browser_id": "abc123", "name": "shop-1"}]
+        file_path (str, optional): Path of a JSONL file with one profile spec per line
+        manifest_path (str, optional): JSONL file recording the result of every item, default is "<file_path>.manifest.jsonl" when file_path is given
+        resume (bool, optional): Skip items the manifest already records as updated, to continue an interrupted run
+        concurrency (int, optional): Maximum number of update requests in flight, default is 5
+    """
+    return await run_profile_batch(
+        "update", update_browser, "update_browser",
+        to_body=lambda args: build_profile_body({"user_id": args.pop("browser_id")}, **args),
+        result_id=lambda args, data: args["browser_id"],
+        profiles=profiles, file_path=file_path, manifest_path=manifest_path,
+        resume=resume, concurrency=concurrency, ctx=ctx,
+    )
+
+# 同步时可直接从 /api/v1/user/list 读取当前值的字段: 期望状态字段 -> 列表中的字段
+SYNC_LISTED_FIELDS = {
+    "name": "name",
+    "domain_name": "domain_name",
+    "username": "username",
+    "group_id": "group_id",
+    "proxy_config": "user_proxy_config",
+    "fingerprint_config": "fingerprint_config",
+}
+
+def config_matches(desired: Any, current: Any) -> bool:
+    """
+    Whether a current value already satisfies a desired one. Dicts match when every desired key
+    matches, so keys the desired state leaves out are not compared. None and "" match a missing
+    value, and scalars are compared as strings since the Local API returns most numbers as strings.
+    """
+    if isinstance(desired, dict):
+        return isinstance(current, dict) and all(config_matches(value, current.get(key)) for key, value in desired.items())
+    if isinstance(desired, list):
+        return isinstance(current, list) and len(desired) == len(current) and all(map(config_matches, desired, current))
+    if desired is None or desired == "":
+        return current is None or current == ""
+    return current is not None and str(desired) == str(current)
+
+def profile_diff(desired: Dict[str, Any], current: Dict[str, Any], applied: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The desired fields that differ from the profile. Fields the profile list returns are compared
+    with the listed values, the others (cookie, password, ...) with the values the last sync applied.
+    """
+    diff = {}
+    for field, value in desired.items():
+        listed = SYNC_LISTED_FIELDS.get(field)
+        changed = not config_matches(value, current[listed]) if listed in current else applied.get(field) != value
+        if changed:
+            diff[field] = value
+    return diff
+
+def load_snapshot(snapshot_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read a sync snapshot: the fields each profile was last synced to, keyed on browser ID.
+    """
+    if not snapshot_path or not os.path.exists(snapshot_path):
+        return {}
+    with open(snapshot_path, encoding="utf-8") as f:
+        return json.load(f)["profiles"]
+
+def save_snapshot(snapshot_path: str, snapshot: Dict[str, Dict[str, Any]]) -> None:
+    temp_path = f"{snapshot_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"profiles": snapshot}, f, ensure_ascii=False)
+    os.replace(temp_path, snapshot_path)
+
+async def fetch_listed_profiles(user_ids: set, ctx: Context = None) -> tuple:
+    """
+    Page through the profile list until every profile in user_ids was seen. Returns (profiles by ID, pages read).
+    """
+    found: Dict[str, Dict[str, Any]] = {}
+    pages = 0
+    async for items in iter_pages("get_browser_list", window=LIST_PREFETCH_PAGES):
+        pages += 1
+        found.update((profile["user_id"], profile) for profile in items if profile["user_id"] in user_ids)
+        if ctx is not None:
+            await ctx.report_progress(len(found), len(user_ids))
+        if len(found) == len(user_ids):
+            break
+    return found, pages
+
+@mcp.tool()
+async def sync_browsers(
+    file_path: str = None,
+    profiles: List[Dict[str, Any]] = None,
+    snapshot_path: str = None,
+    dry_run: bool = False,
+    concurrency: int = None,
+    ctx: Context = None
+) -> str:
+    """
+    Bring browser profiles in line with a desired state, sending only the updates and group moves that are actually needed.
+
+    The desired state has the same fields as update_browser, including browser_id, one profile per JSONL line. Current configs are read from the profile list and compared field by field; group changes are sent as batched moves. Fields the profile list does not return (cookie, password, open_urls, ...) are compared with a snapshot of what the last sync applied.
+
+    Args:
+        file_path (str, optional): Path of a JSONL file with the desired state of each profile
+        profiles (List[Dict], optional): Desired states given inline, e.g. [{"browser_id": "abc123", "group_id": "2", "proxy_config": {...}}]
+        snapshot_path (str, optional): JSON file recording what each sync applied, default is "<file_path>.snapshot.json" when file_path is given
+        dry_run (bool, optional): Only report the changes that would be sent
+        concurrency (int, optional): Maximum number of update requests in flight, default is 5
+    """
+    try:
+        specs = load_profile_specs(profiles, file_path)
+        snapshot_path = snapshot_path or (f"{file_path}.snapshot.json" if file_path else None)
+        snapshot = load_snapshot(snapshot_path)
+    except (OSError, ValueError, KeyError) as e:
+        return f"Failed to sync browsers, error: {e}"
+    if not specs:
+        return "Failed to sync browsers, error: no profiles or file_path given"
+    arguments, errors = validate_profile_specs(update_browser, specs)
+    seen = set()
+    for index, args in enumerate(arguments):
+        if args["browser_id"] in seen:
+            errors.append(f"item {index}: browser_id {args['browser_id']} appears more than once")
+        seen.add(args["browser_id"])
+    # 每个目标分组只检查一次, 分组不存在时每个移动批次都会失败
+    group_ids = dict.fromkeys(str(args["group_id"]) for args in arguments if args.get("group_id") is not None)
+    try:
+        missing_groups = {group_id for group_id in group_ids if not await group_exists(group_id)} if not errors else set()
+    except LocalApiError as e:
+        return f"Failed to sync browsers, error: {e}"
+    errors.extend(f"item {index}: group_id: group {args['group_id']} does not exist"
+                  for index, args in enumerate(arguments) if str(args.get("group_id")) in missing_groups)
+    if errors:
+        return f"Failed to sync browsers, {len(errors)} validation errors, nothing was sent:\n{format_validation_errors(errors)}"
+    desired = {args["browser_id"]: {field: value for field, value in args.items() if field != "browser_id" and value is not None}
+               for args in arguments}
+
+    try:
+        current, pages = await fetch_listed_profiles(set(desired), ctx)
+    except LocalApiError as e:
+        return f"Failed to sync browsers, error: {e}"
+    diffs = {user_id: profile_diff(fields, current[user_id], snapshot.get(user_id, {}))
+             for user_id, fields in desired.items() if user_id in current}
+    updates = {user_id: {field: value for field, value in diff.items() if field != "group_id"} for user_id, diff in diffs.items()}
+    updates = {user_id: fields for user_id, fields in updates.items() if fields}
+    moves: Dict[str, List[str]] = collections.defaultdict(list)
+    for user_id, diff in diffs.items():
+        if "group_id" in diff:
+            moves[diff["group_id"]].append(user_id)
+    changed = [user_id for user_id in desired if diffs.get(user_id)]
+    missing = [user_id for user_id in desired if user_id not in current]
+    unchanged = len(diffs) - len(changed)
+    batches = sum(-(-len(user_ids) // BATCH_SIZE) for user_ids in moves.values())
+
+    if dry_run:
+        actions = {(True, False): "would update", (False, True): "would move", (True, True): "would update + move"}
+        rows = [[user_id, ", ".join(diffs[user_id]), actions[user_id in updates, "group_id" in diffs[user_id]]] for user_id in changed]
+        rows.extend([user_id, "", "not found"] for user_id in missing)
+        title = (f"Sync plan for {len(desired)} browsers: {unchanged} unchanged, {len(updates)} update calls, "
+                 f"{batches} move batches, {len(missing)} not found ({pages} list pages read):")
+        return format_bulk_summary(title, rows, ["browser", "changed fields", "action"])
+
+    async def update(user_id: str) -> Dict[str, Any]:
+        return await request_api("update_browser", json=build_profile_body({"user_id": user_id}, **updates[user_id]))
+
+    update_ids = list(updates)
+    update_results = dict(zip(update_ids, await run_bulk(update_ids, update, concurrency, ctx)))
+    move_results: Dict[str, Optional[str]] = {}
+    for results in await asyncio.gather(*(
+        run_id_batches("move_browser", user_ids, lambda chunk, group_id=group_id: {"group_id": group_id, "user_ids": chunk}, concurrency, ctx)
+        for group_id, user_ids in moves.items()
+    )):
+        move_results.update(results)
+
+    rows = []
+    failed = 0
+    for user_id in changed:
+        applied = snapshot.setdefault(user_id, {})
+        errors = []
+        if user_id in update_results:
+            if update_results[user_id]["code"] == 0:
+                applied.update(updates[user_id])
+            else:
+                errors.append(f"update: {update_results[user_id]['msg']}")
+        if user_id in move_results:
+            if move_results[user_id] is None:
+                applied["group_id"] = diffs[user_id]["group_id"]
+            else:
+                errors.append(f"move: {move_results[user_id]}")
+        failed += bool(errors)
+        rows.append([user_id, ", ".join(diffs[user_id]), "failed" if errors else "ok", "; ".join(errors)])
+    rows.extend([user_id, "", "failed", "not found in the profile list"] for user_id in missing)
+    synced = len(changed) - failed
+    failed += len(missing)
+    if snapshot_path:
+        try:
+            save_snapshot(snapshot_path, snapshot)
+        except OSError as e:
+            rows.append(["", "", "failed", f"could not write snapshot {snapshot_path}: {e}"])
+
+    counts = (f"{unchanged} unchanged, {synced} changed, {pages} list pages, "
+              f"{len(updates)} update calls, {batches} move batches")
+    title = f"Failed to sync {failed}/{len(desired)} browsers ({counts})" if failed else f"Synced {len(desired)} browsers ({counts})"
+    if snapshot_path:
+        title += f", snapshot: {snapshot_path}"
+    return format_bulk_summary(title + ":", rows, ["browser", "changed fields", "status", "error"])
 
 @mcp.tool()
-def get_browser_list(group_id: str = None, size: int = None, browser_id: str = None, serial_number: str = None, sort: str = None, order: str = None) -> str:
+async def validate_profiles(profiles: List[Dict[str, Any]] = None, file_path: str = None, action: Literal["create", "update"] = "create") -> str:
+    """
+    Check profile specs locally without sending anything, e.g. before a large create_browsers or update_browsers run.
+
+    Specs are checked exactly as create_browser / update_browser would check them: field types and allowed values of proxy_config and fingerprint_config, unknown fields, proxy host and port, and the cookie format.
+
+    Args:
+        profiles (List[Dict], optional): Profile specs with the same fields as create_browser / update_browser
+        file_path (str, optional): Path of a JSONL file with one profile spec per line
+        action (str, optional): "create" or "update", default is "create"
+    """
+    try:
+        specs = load_profile_specs(profiles, file_path)
+    except OSError as e:
+        return f"Failed to validate profiles, error: {e}"
+    if not specs:
+        return "Failed to validate profiles, error: no profiles or file_path given"
+    tool = create_browser if action == "create" else update_browser
+    tool_arg_model(tool)
+    started = time.perf_counter()
+    _, errors = validate_profile_specs(tool, specs)
+    per_spec = (time.perf_counter() - started) / len(specs) * 1e6
+    if errors:
+        return f"Failed validation, {len(errors)} errors in {len(specs)} specs:\n{format_validation_errors(errors)}"
+    return f"All {len(specs)} specs are valid for {action}_browser ({per_spec:.0f} µs per spec)"
+
+@mcp.tool()
+async def delete_browser(
+    browser_ids: List[str] = None,
+    select: Dict[str, str] = None,
+    refresh: bool = True,
+    dry_run: bool = False,
+    concurrency: int = None,
+    ctx: Context = None
+) -> str:
+    """
+    Delete one or more browser profiles, given by ID and/or selected by a filter.
+
+    Any number of profiles can be given: they are deleted in batches of 100, and every profile's outcome is reported.
+
+    Args:
+        browser_ids (List[str], optional): Browser IDs to delete
+        select (Dict[str, str], optional): Also delete every profile matching these filters, as in search_browsers, e.g. {"group_id": "3"} or {"name": "tmp-*"}
+        refresh (bool, optional): Rebuild the profile index before resolving `select`, default is True. Set False to use the cached index, which may miss changes made outside this server
+        dry_run (bool, optional): Only list the profiles that would be deleted
+        concurrency (int, optional): Maximum number of batches in flight, default is 5
+    """
+    try:
+        user_ids = await select_browser_ids(browser_ids, select, refresh, ctx)
+    except (LocalApiError, sqlite3.Error) as e:
+        return f"Failed to select browsers, error: {e}"
+    if not user_ids:
+        return "Failed to delete browsers, error: no browser_ids given and no profile matches select"
+    if dry_run:
+        return f"Would delete {len(user_ids)} browsers: {', '.join(user_ids)}"
+    results = await run_id_batches("delete_browser", user_ids, lambda chunk: {"user_ids": chunk}, concurrency, ctx)
+    return format_id_results("deleted", results)
+
+@mcp.tool()
+async def get_browser_list(
+    group_id: str = None,
+    size: int = None,
+    browser_id: str = None,
+    serial_number: str = None,
+    sort: str = None,
+    order: str = None,
+    page: int = None,
+    all: bool = False,
+    format: ListFormat = "text",
+    fields: List[str] = None,
+    ctx: Context = None
+) -> str:
     """
     Get a list of browser profiles.
+
+    Args:
+        group_id (str, optional): Only list profiles in this group
+        size (int, optional): Page size, at most 100
+        browser_id (str, optional): Only list the profile with this Browser ID
+        serial_number (str, optional): Only list the profile with this Serial Number
+        sort (str, optional): Sort field
+        order (str, optional): "asc" or "desc", default is "asc"
+        page (int, optional): Page number to fetch, starting at 1. The result names the next page to request when more profiles exist
+        all (bool, optional): Page through the full list (starting at `page` if given), fetching several pages concurrently. Stops early at the server's item cap and reports the page to resume from
+        format (str, optional): One of ["text", "json", "tsv"], default is "text". "json" and "tsv" are much more compact for large lists
+        fields (List[str], optional): Only return these fields of each profile, e.g. ["user_id", "name", "user_proxy_config.proxy_host"]
     """
     params = {}
     if size:
@@ -338,34 +2380,103 @@ def get_browser_list(group_id: str = None, size: int = None, browser_id: str = N
         params["serial_number"] = serial_number
     if sort:
         params["user_sort"] = {"[sort]": order or "asc"}
+    if page:
+        params["page"] = str(page)
 
-    response = httpx.get(f"{LOCAL_API_BASE}{API_ENDPOINTS['get_browser_list']}", params=params)
-    if response.status_code == 200:
-        data = response.json()
-        if data["code"] == 0:
-            return f"Browser list:\n{data['data']['list']}"
-        else:
+    if not all:
+        data = await request_api("get_browser_list", params=params)
+        if data["code"] != 0:
             return f"Failed to get browser list, error: {data['msg']}"
-    else:
-        return f"Failed to get browser list, error: {response.text}"
+        profiles = data["data"]["list"]
+        if page and size and len(profiles) == size:
+            return f"Browser list (page {page}, next page: {page + 1}):\n{render_list(profiles, format, fields)}"
+        return f"Browser list:\n{render_list(profiles, format, fields)}"
+
+    page_size = min(size or LIST_PAGE_SIZE, LIST_PAGE_SIZE)
+    start_page = page or 1
+    renderer = ListRenderer(format, fields)
+    pages_read = 0
+    params.pop("page", None)
+    params.pop("page_size", None)
+    try:
+        async for items in iter_pages("get_browser_list", params, page_size, start_page, LIST_PREFETCH_PAGES):
+            renderer.feed(items)
+            pages_read += 1
+            if ctx is not None:
+                await ctx.report_progress(renderer.count)
+            if len(items) == page_size and renderer.count >= LIST_MAX_ITEMS:
+                return (f"Browser list ({renderer.count} profiles, stopped at the {LIST_MAX_ITEMS} item cap, "
+                        f"next page: {start_page + pages_read}):\n{renderer.getvalue()}")
+    except LocalApiError as e:
+        return f"Failed to get browser list after {renderer.count} profiles, error: {e}"
+    return f"Browser list ({renderer.count} profiles):\n{renderer.getvalue()}"
 
 @mcp.tool()
-def get_opened_browser() -> str:
+async def search_browsers(
+    name: str = None,
+    group_id: str = None,
+    proxy_host: str = None,
+    filters: Dict[str, str] = None,
+    refresh: bool = False,
+    limit: int = 100,
+    format: ListFormat = "text",
+    fields: List[str] = None,
+    ctx: Context = None
+) -> str:
+    """
+    Search browser profiles by any field using a local index, e.g. all profiles named like "shop-*" or using one proxy host.
+
+    The index is built from the full profile list on first use and kept up to date by this server's own writes.
+
+    Args:
+        name (str, optional): Profile name; * and ? are wildcards, e.g. "shop-*"
+        group_id (str, optional): Group id
+        proxy_host (str, optional): Proxy host, wildcards allowed
+        filters (Dict[str, str], optional): More field filters, wildcards allowed. Keys may be dotted paths into the profile, e.g. {"proxy_type": "socks5", "fingerprint_config.browser_kernel_config.version": "134"}
+        refresh (bool, optional): Rebuild the index from the Local API before searching, to pick up changes made outside this server
+        limit (int, optional): Maximum number of profiles to return, default is 100
+        format (str, optional): One of ["text", "json", "tsv"], default is "text"
+        fields (List[str], optional): Only return these fields of each profile, e.g. ["user_id", "name"]
+    """
+    criteria = dict(filters or {})
+    if name:
+        criteria["name"] = name
+    if group_id:
+        criteria["group_id"] = group_id
+    if proxy_host:
+        criteria["proxy_host"] = proxy_host
+
+    try:
+        await profile_index.rebuild(ctx, max_age=None if refresh else INDEX_MAX_AGE)
+    except LocalApiError as e:
+        return f"Failed to build browser index, error: {e}"
+    try:
+        total, profiles = profile_index.search(criteria, limit)
+    except sqlite3.Error as e:
+        return f"Failed to search browsers, error: {e}"
+    return f"Found {total} browsers (showing {len(profiles)}):\n{render_list(profiles, format, fields)}"
+
+@mcp.tool()
+async def get_opened_browser(format: ListFormat = "text", fields: List[str] = None, refresh: bool = False) -> str:
     """
     Get a list of currently opened browsers.
+
+    The list is served from the server's tracked state, which is kept in sync in the background.
+
+    Args:
+        format (str, optional): One of ["text", "json", "tsv"], default is "text"
+        fields (List[str], optional): Only return these fields of each browser, e.g. ["user_id", "debug_port"]
+        refresh (bool, optional): Query the Local API instead of the tracked state
     """
-    response = httpx.get(f"{LOCAL_API_BASE}{API_ENDPOINTS['get_opened_browser']}")
-    if response.status_code == 200:
-        data = response.json()
-        if data["code"] == 0:
-            return f"Opened browser list:\n{data['data']['list']}"
-        else:
-            return f"Failed to get opened browser list, error: {data['msg']}"
-    else:
-        return f"Failed to get opened browser list, error: {response.text}"
+    if refresh or not browser_tracker.is_fresh():
+        try:
+            await browser_tracker.reconcile()
+        except LocalApiError as e:
+            return f"Failed to get opened browser list, error: {e}"
+    return f"Opened browser list:\n{render_list(browser_tracker.browsers, format, fields)}"
 
 @mcp.tool()
-def create_group(group_name: str, remark: str = None) -> str:
+async def create_group(group_name: str, remark: str = None) -> str:
     """
     Create a new browser group.
     """
@@ -373,18 +2484,13 @@ def create_group(group_name: str, remark: str = None) -> str:
     if remark:
         request_body["remark"] = remark
 
-    response = httpx.post(f"{LOCAL_API_BASE}{API_ENDPOINTS['create_group']}", json=request_body)
-    if response.status_code == 200:
-        data = response.json()
-        if data["code"] == 0:
-            return f"Group created successfully with name: {group_name}{f', remark: {remark}' if remark else ''}"
-        else:
-            return f"Failed to create group, error: {data['msg']}"
-    else:
-        return f"Failed to create group, error: {response.text}"
+    data = await request_api("create_group", json=request_body)
+    if data["code"] == 0:
+        return f"Group created successfully with name: {group_name}{f', remark: {remark}' if remark else ''}"
+    return f"Failed to create group, error: {data['msg']}"
 
 @mcp.tool()
-def update_group(group_id: str, group_name: str, remark: str = None) -> str:
+async def update_group(group_id: str, group_name: str, remark: str = None) -> str:
     """
     Update an existing browser group.
     """
@@ -395,21 +2501,22 @@ def update_group(group_id: str, group_name: str, remark: str = None) -> str:
     if remark is not None:
         request_body["remark"] = remark
 
-    response = httpx.post(f"{LOCAL_API_BASE}{API_ENDPOINTS['update_group']}", json=request_body)
-    if response.status_code == 200:
-        data = response.json()
-        if data["code"] == 0:
-            remark_str = f", remark: {'(cleared)' if remark is None else remark}" if remark is not None else ""
-            return f"Group updated successfully with id: {group_id}, name: {group_name}{remark_str}"
-        else:
-            return f"Failed to update group, error: {data['msg']}"
-    else:
-        return f"Failed to update group, error: {response.text}"
+    data = await request_api("update_group", json=request_body)
+    if data["code"] == 0:
+        remark_str = f", remark: {'(cleared)' if remark is None else remark}" if remark is not None else ""
+        return f"Group updated successfully with id: {group_id}, name: {group_name}{remark_str}"
+    return f"Failed to update group, error: {data['msg']}"
 
 @mcp.tool()
-def get_group_list(name: str = None, size: int = None) -> str:
+async def get_group_list(name: str = None, size: int = None, format: ListFormat = "text", fields: List[str] = None) -> str:
     """
     Get a list of browser groups.
+
+    Args:
+        name (str, optional): Filter by group name
+        size (int, optional): Page size
+        format (str, optional): One of ["text", "json", "tsv"], default is "text"
+        fields (List[str], optional): Only return these fields of each group, e.g. ["group_id", "group_name"]
     """
     params = {}
     if name:
@@ -417,55 +2524,127 @@ def get_group_list(name: str = None, size: int = None) -> str:
     if size:
         params["page_size"] = str(size)
 
-    response = httpx.get(f"{LOCAL_API_BASE}{API_ENDPOINTS['get_group_list']}", params=params)
-    if response.status_code == 200:
-        data = response.json()
-        if data["code"] == 0:
-            return f"Group list:\n{data['data']['list']}"
-        else:
-            return f"Failed to get group list, error: {data['msg']}"
-    else:
-        return f"Failed to get group list, error: {response.text}"
+    data = await request_api("get_group_list", params=params)
+    if data["code"] == 0:
+        return f"Group list:\n{render_list(data['data']['list'], format, fields)}"
+    return f"Failed to get group list, error: {data['msg']}"
 
 @mcp.tool()
-def get_application_list(size: int = None) -> str:
+async def get_application_list(size: int = None, format: ListFormat = "text", fields: List[str] = None) -> str:
     """
     Get a list of applications.
+
+    Args:
+        size (int, optional): Page size
+        format (str, optional): One of ["text", "json", "tsv"], default is "text"
+        fields (List[str], optional): Only return these fields of each application
     """
     params = {}
     if size:
         params["page_size"] = str(size)
 
-    response = httpx.get(f"{LOCAL_API_BASE}{API_ENDPOINTS['get_application_list']}", params=params)
-    if response.status_code == 200:
-        data = response.json()
-        if data["code"] == 0:
-            return f"Application list:\n{data['data']['list']}"
-        else:
-            return f"Failed to get application list, error: {data['msg']}"
-    else:
-        return f"Failed to get application list, error: {response.text}"
+    data = await request_api("get_application_list", params=params)
+    if data["code"] == 0:
+        return f"Application list:\n{render_list(data['data']['list'], format, fields)}"
+    return f"Failed to get application list, error: {data['msg']}"
 
 @mcp.tool()
-def move_browser(group_id: str, browser_ids: List[str]) -> str:
+async def move_browser(
+    group_id: str,
+    browser_ids: List[str] = None,
+    select: Dict[str, str] = None,
+    refresh: bool = True,
+    dry_run: bool = False,
+    concurrency: int = None,
+    ctx: Context = None
+) -> str:
     """
-    Move browsers to a different group.
+    Move browsers to a different group, given by ID and/or selected by a filter.
+
+    Any number of profiles can be given: they are moved in batches of 100, and every profile's outcome is reported.
+
+    Args:
+        group_id (str): The group to move the browsers to
+        browser_ids (List[str], optional): Browser IDs to move
+        select (Dict[str, str], optional): Also move every profile matching these filters, as in search_browsers, e.g. {"group_id": "3"} to move a whole group
+        refresh (bool, optional): Rebuild the profile index before resolving `select`, default is True. Set False to use the cached index, which may miss changes made outside this server
+        dry_run (bool, optional): Only list the profiles that would be moved
+        concurrency (int, optional): Maximum number of batches in flight, default is 5
     """
-    request_body = {
-        "group_id": group_id,
-        "user_ids": browser_ids
-    }
+    try:
+        user_ids = await select_browser_ids(browser_ids, select, refresh, ctx)
+    except (LocalApiError, sqlite3.Error) as e:
+        return f"Failed to select browsers, error: {e}"
+    if not user_ids:
+        return "Failed to move browsers, error: no browser_ids given and no profile matches select"
+    if dry_run:
+        return f"Would move {len(user_ids)} browsers to group {group_id}: {', '.join(user_ids)}"
+    # 目标分组不存在时每个批次都会以同一错误失败, 发送前先检查一次
+    try:
+        if not await group_exists(group_id):
+            return f"Failed to move browsers, error: group {group_id} does not exist"
+    except LocalApiError as e:
+        return f"Failed to move browsers, error: {e}"
+    results = await run_id_batches("move_browser", user_ids, lambda chunk: {"group_id": group_id, "user_ids": chunk}, concurrency, ctx)
+    return format_id_results(f"moved to group {group_id}", results)
 
-    response = httpx.post(f"{LOCAL_API_BASE}{API_ENDPOINTS['move_browser']}", json=request_body)
-    if response.status_code == 200:
-        data = response.json()
-        if data["code"] == 0:
-            return f"Browsers moved successfully to group {group_id}: {', '.join(browser_ids)}"
-        else:
-            return f"Failed to move browsers, error: {data['msg']}"
-    else:
-        return f"Failed to move browsers, error: {response.text}"
+@mcp.resource("adspower://stats/cache", mime_type="application/json")
+def cache_stats() -> str:
+    """
+    Hit, miss, eviction and invalidation counters of the list response cache.
+    """
+    return json.dumps(api_cache.stats())
+
+@mcp.resource("adspower://stats/pool", mime_type="application/json")
+def pool_stats() -> str:
+    """
+    Idle and leased browsers of the warm browser pool.
+    """
+    return json.dumps(browser_pool.stats())
+
+@mcp.resource("adspower://stats/metrics", mime_type="application/json")
+def metrics_stats() -> str:
+    """
+    Per-tool and per-endpoint latency (p50/p99), in-flight, error, retry and payload size metrics.
+    """
+    return json.dumps(metrics.snapshot())
+
+@mcp.resource("adspower://stats/metrics/prometheus", mime_type="text/plain")
+def metrics_prometheus() -> str:
+    """
+    The same metrics in Prometheus text exposition format.
+    """
+    return metrics.to_prometheus()
+
+STARTUP_TIMES["init"] = time.perf_counter() - _process_started - STARTUP_TIMES["imports"]
+for phase in ("imports", "init"):
+    metrics.set("adspower_startup_seconds", STARTUP_TIMES[phase], phase=phase)
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AdsPower Local API MCP server")
+    parser.add_argument("--transport", choices=["stdio", "sse"], default="stdio",
+                        help="stdio serves one client; sse serves many clients from one process, sharing caches, connections and the rate limit")
+    parser.add_argument("--host", default="127.0.0.1", help="SSE listen address")
+    parser.add_argument("--port", type=int, default=8000, help="SSE listen port")
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENT_TOOLS,
+                        help="maximum tool calls running at once across all sessions, 0 for no limit")
+    args = parser.parse_args()
+
     # Initialize and run the server
-    mcp.run(transport='stdio')
+    if mcp.schema_cache:
+        try:
+            mcp.schema_cache.save()
+        except OSError as e:
+            logger.warning("Could not write tool schema cache %s: %s", SCHEMA_CACHE, e)
+    logger.info(
+        "Imports took %.0f ms, initialization %.0f ms (%s)",
+        STARTUP_TIMES["imports"] * 1000,
+        STARTUP_TIMES["init"] * 1000,
+        f"{mcp.schema_cache.hits} tool schemas from cache" if mcp.schema_cache else "schema cache off",
+    )
+    mcp.set_max_concurrency(args.max_concurrency)
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+    mcp.run(transport=args.transport)
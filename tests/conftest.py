@@ -0,0 +1,46 @@
+"""
+Shared fixtures: main.py talks to an in-process MockLocalApi through httpx.ASGITransport, with
+client-side rate limiting off and fresh caches, index, tracker and pool for every test.
+"""
+import collections
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "benchmarks")]
+os.environ["ADSPOWER_RATE_LIMIT"] = "0"
+os.environ.pop("ADSPOWER_SCHEMA_CACHE", None)
+
+import httpx
+import main
+from mock_local_api import MockLocalApi
+
+@pytest.fixture
+def api(monkeypatch) -> MockLocalApi:
+    """
+    A mock Local API with 20 profiles in 3 groups and no latency. `api.calls` counts the requests
+    main.py sent to each endpoint; `api.hooks` holds extra async request hooks for the test.
+    """
+    api = MockLocalApi(profiles=20, groups=3, rate_limit=0, latency_scale=0)
+    api.calls = collections.Counter()
+    api.hooks = []
+    endpoints = {path: endpoint for endpoint, path in main.API_ENDPOINTS.items()}
+
+    async def on_request(request: httpx.Request) -> None:
+        endpoint = endpoints[request.url.path]
+        api.calls[endpoint] += 1
+        for hook in api.hooks:
+            await hook(endpoint, request)
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url=main.LOCAL_API_BASE,
+                               event_hooks={"request": [on_request]})
+    monkeypatch.setattr(main, "_http_client", client)
+    monkeypatch.setattr(main, "api_cache", main.TTLCache(main.CACHE_MAX_ENTRIES, 60))
+    monkeypatch.setattr(main, "profile_index", main.ProfileIndex(":memory:"))
+    monkeypatch.setattr(main, "browser_tracker", main.BrowserTracker())
+    monkeypatch.setattr(main, "browser_pool", main.BrowserPool(None, 0, main.POOL_MAX_OPEN, main.POOL_IDLE_TIMEOUT))
+    monkeypatch.setattr(main, "_inflight_reads", {})
+    return api
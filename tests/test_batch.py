@@ -0,0 +1,53 @@
+import asyncio
+import json
+
+import main
+
+def read_manifest(path) -> list:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+def test_update_browsers_records_every_item(api, tmp_path):
+    manifest = tmp_path / "manifest.jsonl"
+    user_ids = list(api.profiles)[:4]
+    profiles = [{"browser_id": user_id, "name": f"batch-{i}"} for i, user_id in enumerate(user_ids)]
+
+    result = asyncio.run(main.update_browsers(profiles=profiles, manifest_path=str(manifest)))
+
+    assert result.startswith("Updated 4/4 browsers")
+    assert sorted(entry["index"] for entry in read_manifest(manifest)) == [0, 1, 2, 3]
+    assert [api.profiles[user_id]["name"] for user_id in user_ids] == ["batch-0", "batch-1", "batch-2", "batch-3"]
+
+def test_invalid_spec_sends_nothing(api, tmp_path):
+    profiles = [{"browser_id": next(iter(api.profiles)), "name": "ok"}, {"browser_id": "x", "group_id": "abc"}]
+
+    result = asyncio.run(main.update_browsers(profiles=profiles, manifest_path=str(tmp_path / "manifest.jsonl")))
+
+    assert result.startswith("Failed to update browsers, 1 validation errors, nothing was sent:")
+    assert api.calls["update_browser"] == 0
+
+def test_resume_skips_items_already_done(api, tmp_path):
+    manifest = tmp_path / "manifest.jsonl"
+    user_ids = list(api.profiles)[:4]
+    profiles = [{"browser_id": user_id, "name": f"batch-{i}"} for i, user_id in enumerate(user_ids)]
+    asyncio.run(main.update_browsers(profiles=profiles[:2], manifest_path=str(manifest)))
+    calls = api.calls["update_browser"]
+
+    result = asyncio.run(main.update_browsers(profiles=profiles, manifest_path=str(manifest), resume=True))
+
+    assert result.startswith("Updated 2/2 browsers (2 already done in a previous run)")
+    assert api.calls["update_browser"] - calls == 2
+
+def test_resume_after_a_truncated_last_line(api, tmp_path):
+    manifest = tmp_path / "manifest.jsonl"
+    user_ids = list(api.profiles)[:3]
+    profiles = [{"browser_id": user_id, "name": f"batch-{i}"} for i, user_id in enumerate(user_ids)]
+    asyncio.run(main.update_browsers(profiles=profiles, manifest_path=str(manifest)))
+    lines = manifest.read_text(encoding="utf-8").splitlines()
+    manifest.write_text("\n".join(lines[:2]) + "\n" + lines[2][:len(lines[2]) // 2], encoding="utf-8")
+    truncated = json.loads(lines[2])["index"]
+
+    result = asyncio.run(main.update_browsers(profiles=profiles, manifest_path=str(manifest), resume=True))
+
+    assert result.startswith("Updated 1/1 browsers (2 already done in a previous run)")
+    assert {entry["index"] for entry in main.load_manifest(str(manifest)).values()} == {0, 1, 2}
+    assert json.loads(manifest.read_text(encoding="utf-8").splitlines()[-1])["index"] == truncated
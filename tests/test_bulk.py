@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import httpx
+
+import main
+
+def use_transport(monkeypatch, handler) -> list:
+    """
+    Route main.py's requests to `handler` instead of the mock API; returns the list of sent requests.
+    """
+    sent = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        return handler(request)
+
+    monkeypatch.setattr(main, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(record), base_url=main.LOCAL_API_BASE))
+    return sent
+
+def test_failed_batch_is_split_down_to_the_bad_ids(api):
+    user_ids = list(api.profiles)[:10]
+    user_ids[2], user_ids[7] = "missing-1", "missing-2"
+
+    results = asyncio.run(main.run_id_batches("delete_browser", user_ids, lambda chunk: {"user_ids": chunk}))
+
+    assert list(results) == user_ids
+    assert {user_id for user_id, error in results.items() if error} == {"missing-1", "missing-2"}
+    assert results["missing-1"] == "user_id is not exist"
+    assert not set(user_ids) & set(api.profiles)
+
+def test_whole_batch_errors_are_not_split(api, monkeypatch):
+    sent = use_transport(monkeypatch, lambda request: httpx.Response(200, json={"code": -1, "msg": "Insufficient permission"}))
+    user_ids = [f"id-{i}" for i in range(200)]
+
+    results = asyncio.run(main.run_id_batches("delete_browser", user_ids, lambda chunk: {"user_ids": chunk}))
+
+    assert len(sent) == 2
+    assert set(results.values()) == {"Insufficient permission"}
+
+def test_transport_errors_are_not_split(api, monkeypatch):
+    def refuse(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    sent = use_transport(monkeypatch, refuse)
+    user_ids = [f"id-{i}" for i in range(200)]
+
+    results = asyncio.run(main.run_id_batches("delete_browser", user_ids, lambda chunk: {"user_ids": chunk}))
+
+    assert len(sent) == 2
+    assert all(error.startswith("unknown, not confirmed (ConnectError") for error in results.values())
+
+def test_timed_out_delete_is_not_resent(api, monkeypatch):
+    def apply_then_time_out(request: httpx.Request) -> httpx.Response:
+        for user_id in json.loads(request.content)["user_ids"]:
+            api.profiles.pop(user_id, None)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    sent = use_transport(monkeypatch, apply_then_time_out)
+    user_ids = list(api.profiles)[:10]
+
+    result = asyncio.run(main.delete_browser(browser_ids=user_ids))
+
+    assert len(sent) == 1
+    assert "user_id is not exist" not in result
+    assert result.count("unknown, not confirmed (ReadTimeout") == 10
+
+def test_move_to_missing_group_sends_no_batches(api):
+    result = asyncio.run(main.move_browser("99", browser_ids=list(api.profiles)[:3]))
+
+    assert result == "Failed to move browsers, error: group 99 does not exist"
+    assert api.calls["move_browser"] == 0
+
+def test_move_browser_reports_every_id(api):
+    user_ids = list(api.profiles)[:3]
+
+    result = asyncio.run(main.move_browser("2", browser_ids=user_ids))
+
+    assert result == f"Browsers moved to group 2 successfully: {', '.join(user_ids)}"
+    assert all(api.profiles[user_id]["group_id"] == "2" for user_id in user_ids)
+
+def test_select_is_resolved_against_a_fresh_index(api):
+    async def scenario() -> str:
+        await main.search_browsers(group_id="1")
+        moved = next(user_id for user_id, profile in api.profiles.items() if profile["group_id"] == "1")
+        api.profiles[moved]["group_id"] = "2"
+        await main.delete_browser(select={"group_id": "1"})
+        return moved
+
+    moved = asyncio.run(scenario())
+
+    assert moved in api.profiles
+    assert not any(profile["group_id"] == "1" for profile in api.profiles.values())
+
+def test_select_can_use_the_cached_index(api):
+    async def scenario() -> str:
+        await main.search_browsers(group_id="1")
+        moved = next(user_id for user_id, profile in api.profiles.items() if profile["group_id"] == "1")
+        api.profiles[moved]["group_id"] = "2"
+        return await main.delete_browser(select={"group_id": "1"}, refresh=False, dry_run=True), moved
+
+    result, moved = asyncio.run(scenario())
+
+    assert moved in result
@@ -0,0 +1,75 @@
+import asyncio
+
+import main
+
+def test_update_invalidates_cached_lists(api):
+    user_id = next(iter(api.profiles))
+
+    async def scenario() -> str:
+        await main.get_browser_list(browser_id=user_id)
+        await main.get_browser_list(browser_id=user_id)
+        await main.update_browser(browser_id=user_id, name="renamed")
+        return await main.get_browser_list(browser_id=user_id)
+
+    result = asyncio.run(scenario())
+
+    assert api.calls["get_browser_list"] == 2
+    assert "renamed" in result
+
+def test_create_group_invalidates_the_group_list(api):
+    async def scenario() -> str:
+        await main.get_group_list(size=100)
+        await main.get_group_list(size=100)
+        await main.create_group(group_name="new-group")
+        return await main.get_group_list(size=100)
+
+    result = asyncio.run(scenario())
+
+    assert api.calls["get_group_list"] == 2
+    assert "new-group" in result
+
+def test_failed_reads_are_not_cached(api):
+    list_groups = api.get_group_list
+    replies = [{"code": -1, "msg": "server busy"}]
+    api.get_group_list = lambda params, body: replies.pop() if replies else list_groups(params, body)
+
+    async def scenario() -> tuple:
+        return await main.get_group_list(), await main.get_group_list()
+
+    failed, listed = asyncio.run(scenario())
+
+    assert failed == "Failed to get group list, error: server busy"
+    assert listed.startswith("Group list:")
+    assert api.calls["get_group_list"] == 2
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(main.time, "monotonic", lambda: now[0])
+    cache = main.TTLCache(max_entries=10, ttl=5)
+    key = main.TTLCache.key("get_group_list")
+    cache.set(key, {"code": 0}, cache.generation("get_group_list"))
+
+    assert cache.get(key) == {"code": 0}
+    now[0] += 6
+    assert cache.get(key) is None
+
+def test_least_recently_used_entry_is_evicted():
+    cache = main.TTLCache(max_entries=2, ttl=60)
+    keys = [main.TTLCache.key("get_browser_list", {"page": str(page)}) for page in range(3)]
+    cache.set(keys[0], {"page": 0}, 0)
+    cache.set(keys[1], {"page": 1}, 0)
+    cache.get(keys[0])
+    cache.set(keys[2], {"page": 2}, 0)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == {"page": 0}
+    assert cache.stats()["evictions"] == 1
+
+def test_read_started_before_a_write_is_not_cached():
+    cache = main.TTLCache(max_entries=10, ttl=60)
+    key = main.TTLCache.key("get_browser_list")
+    generation = cache.generation("get_browser_list")
+    cache.invalidate("get_browser_list")
+    cache.set(key, {"stale": True}, generation)
+
+    assert cache.get(key) is None
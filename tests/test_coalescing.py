@@ -0,0 +1,65 @@
+import asyncio
+
+import main
+
+def test_identical_concurrent_reads_share_one_request(api):
+    async def scenario() -> list:
+        return await asyncio.gather(*(main.request_api("get_browser_list", params={"page_size": "5"}) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+
+    assert api.calls["get_browser_list"] == 1
+    assert all(result is results[0] for result in results)
+
+def test_read_after_a_write_does_not_join_the_earlier_read(api):
+    release = asyncio.Event()
+    user_id = next(iter(api.profiles))
+    params = {"user_id": user_id}
+
+    async def hold_reads(endpoint, request):
+        if endpoint == "get_browser_list":
+            await release.wait()
+
+    api.hooks.append(hold_reads)
+
+    async def scenario() -> tuple:
+        before = asyncio.create_task(main.request_api("get_browser_list", params=params))
+        while not api.calls["get_browser_list"]:
+            await asyncio.sleep(0)
+        await main.request_api("update_browser", json={"user_id": user_id, "name": "renamed"})
+        after = asyncio.create_task(main.request_api("get_browser_list", params=params))
+        while api.calls["get_browser_list"] < 2:
+            await asyncio.sleep(0)
+        release.set()
+        return await before, await after
+
+    _, after = asyncio.run(scenario())
+
+    assert api.calls["get_browser_list"] == 2
+    assert after["data"]["list"][0]["name"] == "renamed"
+    cached = main.api_cache.get(main.TTLCache.key("get_browser_list", params))
+    assert cached["data"]["list"][0]["name"] == "renamed"
+
+def test_cancelled_caller_does_not_cancel_the_shared_read(api):
+    release = asyncio.Event()
+
+    async def hold_reads(endpoint, request):
+        if endpoint == "get_opened_browser":
+            await release.wait()
+
+    api.hooks.append(hold_reads)
+
+    async def scenario() -> dict:
+        first = asyncio.create_task(main.request_api("get_opened_browser"))
+        second = asyncio.create_task(main.request_api("get_opened_browser"))
+        while not api.calls["get_opened_browser"]:
+            await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        return await second
+
+    data = asyncio.run(scenario())
+
+    assert data["code"] == 0
+    assert api.calls["get_opened_browser"] == 1
+    assert main._inflight_reads == {}
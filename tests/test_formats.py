@@ -0,0 +1,53 @@
+import asyncio
+import json
+
+import main
+
+ROWS = [
+    {"user_id": "a1", "name": "tab\there", "remark": "line1\nline2\r", "path": "C:\\profiles", "user_proxy_config": {"proxy_host": "10.0.0.1", "proxy_port": "8080"}},
+    {"user_id": "b2", "name": "plain", "remark": None, "path": "", "user_proxy_config": {"proxy_host": None}},
+]
+
+def test_tsv_escapes_separators_and_backslashes():
+    tsv = main.render_list(ROWS, "tsv", ["user_id", "name", "remark", "path"])
+
+    assert tsv.split("\n") == [
+        "user_id\tname\tremark\tpath",
+        "a1\ttab\\there\tline1\\nline2\\r\tC:\\\\profiles",
+        "b2\tplain\t\t",
+    ]
+
+def test_tsv_projects_dotted_fields_and_encodes_nested_values_as_json():
+    tsv = main.render_list(ROWS, "tsv", ["user_id", "user_proxy_config.proxy_host", "user_proxy_config"])
+
+    lines = [line.split("\t") for line in tsv.split("\n")]
+    assert lines[0] == ["user_id", "user_proxy_config.proxy_host", "user_proxy_config"]
+    assert lines[1][:2] == ["a1", "10.0.0.1"]
+    assert json.loads(lines[1][2]) == ROWS[0]["user_proxy_config"]
+    assert lines[2][1] == ""
+
+def test_tsv_columns_default_to_the_first_row_keys():
+    tsv = main.render_list(ROWS[1:], "tsv")
+
+    assert tsv.split("\n")[0] == "\t".join(ROWS[1])
+
+def test_json_round_trips_the_projected_rows():
+    rendered = main.render_list(ROWS, "json", ["user_id", "user_proxy_config.proxy_port"])
+
+    assert json.loads(rendered) == [
+        {"user_id": "a1", "user_proxy_config.proxy_port": "8080"},
+        {"user_id": "b2", "user_proxy_config.proxy_port": None},
+    ]
+
+def test_empty_lists_render_in_every_format():
+    assert main.render_list([], "text") == "[]"
+    assert main.render_list([], "json") == "[]"
+    assert main.render_list([], "tsv") == ""
+
+def test_list_tools_accept_a_format(api):
+    user_id = next(iter(api.profiles))
+    api.profiles[user_id]["name"] = "shop\tfront"
+
+    result = asyncio.run(main.get_browser_list(browser_id=user_id, format="tsv", fields=["user_id", "name"]))
+
+    assert result == f"Browser list:\nuser_id\tname\n{user_id}\tshop\\tfront"
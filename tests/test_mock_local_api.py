@@ -0,0 +1,49 @@
+import asyncio
+
+import httpx
+
+import main
+from mock_local_api import MAX_BATCH_SIZE, MAX_PAGE_SIZE, THROTTLED, MockLocalApi
+
+def call(api: MockLocalApi, endpoint: str, params: dict = None, body: dict = None) -> dict:
+    async def send() -> dict:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url=main.LOCAL_API_BASE) as client:
+            response = await client.request(main.API_METHODS.get(endpoint, "POST"), main.API_ENDPOINTS[endpoint], params=params, json=body)
+            return response.json()
+
+    return asyncio.run(send())
+
+def test_pages_are_capped_at_the_api_limit():
+    api = MockLocalApi(profiles=250, groups=2, rate_limit=0, latency_scale=0)
+
+    data = call(api, "get_browser_list", {"page": "2", "page_size": "500"})
+
+    assert len(data["data"]["list"]) == MAX_PAGE_SIZE
+    assert data["data"]["list"][0]["user_id"] == list(api.profiles)[MAX_PAGE_SIZE]
+
+def test_batches_over_the_limit_are_rejected():
+    api = MockLocalApi(profiles=MAX_BATCH_SIZE + 1, groups=1, rate_limit=0, latency_scale=0)
+
+    data = call(api, "delete_browser", body={"user_ids": list(api.profiles)})
+
+    assert data == {"code": -1, "msg": f"user_ids exceeds the limit of {MAX_BATCH_SIZE}"}
+    assert len(api.profiles) == MAX_BATCH_SIZE + 1
+
+def test_batch_errors_do_not_name_the_bad_ids():
+    api = MockLocalApi(profiles=3, groups=1, rate_limit=0, latency_scale=0)
+
+    data = call(api, "delete_browser", body={"user_ids": [*api.profiles, "missing"]})
+
+    assert data["msg"] == "user_id is not exist"
+    assert len(api.profiles) == 3
+
+def test_each_path_has_its_own_rate_limit_window():
+    api = MockLocalApi(profiles=3, groups=1, rate_limit=1, latency_scale=0)
+
+    first = call(api, "get_browser_list")
+    second = call(api, "get_browser_list")
+    other_path = call(api, "get_group_list")
+
+    assert first["code"] == 0 and other_path["code"] == 0
+    assert second == THROTTLED
+    assert api.throttled == 1
@@ -0,0 +1,37 @@
+import asyncio
+
+import main
+
+def listed_ids(result: str) -> list:
+    return result.splitlines()[2:]
+
+def test_all_pages_are_returned_in_order(api):
+    result = asyncio.run(main.get_browser_list(size=6, all=True, format="tsv", fields=["user_id"]))
+
+    assert result.splitlines()[0] == "Browser list (20 profiles):"
+    assert listed_ids(result) == list(api.profiles)
+
+def test_item_cap_reports_the_page_to_resume_from(api, monkeypatch):
+    monkeypatch.setattr(main, "LIST_MAX_ITEMS", 10)
+
+    first = asyncio.run(main.get_browser_list(size=4, all=True, format="tsv", fields=["user_id"]))
+    rest = asyncio.run(main.get_browser_list(size=4, page=4, all=True, format="tsv", fields=["user_id"]))
+
+    assert first.splitlines()[0] == "Browser list (12 profiles, stopped at the 10 item cap, next page: 4):"
+    assert rest.splitlines()[0] == "Browser list (8 profiles):"
+    assert listed_ids(first) + listed_ids(rest) == list(api.profiles)
+
+def test_single_page_names_the_next_page(api):
+    full = asyncio.run(main.get_browser_list(size=5, page=2))
+    last = asyncio.run(main.get_browser_list(size=5, page=5))
+
+    assert full.startswith("Browser list (page 2, next page: 3):")
+    assert last.startswith("Browser list:\n[]")
+
+def test_failed_page_reports_profiles_read_so_far(api):
+    list_page = api.get_browser_list
+    api.get_browser_list = lambda params, body: {"code": -1, "msg": "server busy"} if params.get("page") == "3" else list_page(params, body)
+
+    result = asyncio.run(main.get_browser_list(size=5, all=True))
+
+    assert result == "Failed to get browser list after 10 profiles, error: server busy"
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+import main
+
+@pytest.fixture
+def pool(api, monkeypatch) -> main.BrowserPool:
+    """
+    A pool keeping 2 browsers of group 1 warm, holding at most 3, with a 60 second idle timeout.
+    """
+    pool = main.BrowserPool("1", 2, 3, 60)
+    monkeypatch.setattr(main, "browser_pool", pool)
+    return pool
+
+def test_maintain_warms_the_pool_group(api, pool):
+    asyncio.run(pool.maintain())
+
+    idle = pool.stats()["idle"]["1"]
+    assert len(idle) == 2
+    assert set(idle) <= set(api.opened)
+    assert all(api.profiles[user_id]["group_id"] == "1" for user_id in idle)
+
+def test_released_browser_is_leased_again(api, pool):
+    async def scenario() -> tuple:
+        await pool.maintain()
+        first, warm = await pool.lease()
+        status = await pool.release(first["user_id"])
+        again, _ = await pool.lease()
+        return first, warm, status, again
+
+    first, warm, status, again = asyncio.run(scenario())
+
+    assert warm and status == "idle"
+    assert again["user_id"] == first["user_id"]
+    assert first["data"]["debug_port"] == api.opened[first["user_id"]]["debug_port"]
+
+def test_pool_never_holds_more_than_max_open(api, pool):
+    async def scenario() -> list:
+        await pool.maintain()
+        leases = [await pool.lease() for _ in range(3)]
+        with pytest.raises(main.LocalApiError, match="already holds 3 open browsers"):
+            await pool.lease()
+        return leases
+
+    leases = asyncio.run(scenario())
+
+    assert [warm for _, warm in leases] == [True, True, False]
+    assert len(api.opened) == 3
+
+def test_idle_browsers_past_the_timeout_are_closed(api, pool):
+    async def scenario() -> str:
+        entry, _ = await pool.lease("2")
+        await pool.release(entry["user_id"])
+        pool._idle["2"][entry["user_id"]]["since"] -= 120
+        await pool.maintain()
+        return entry["user_id"]
+
+    user_id = asyncio.run(scenario())
+
+    assert user_id not in api.opened
+    assert "2" not in pool.stats()["idle"]
+    assert len(pool.stats()["idle"]["1"]) == 2
+
+def test_warm_browsers_are_kept_past_the_timeout(api, pool):
+    async def scenario() -> None:
+        await pool.maintain()
+        for entry in pool._idle["1"].values():
+            entry["since"] -= 120
+        await pool.maintain()
+
+    asyncio.run(scenario())
+
+    assert len(pool.stats()["idle"]["1"]) == 2
+    assert api.calls["close_browser"] == 0
+
+def test_browsers_closed_outside_the_pool_are_replaced(api, pool):
+    async def scenario() -> tuple:
+        await pool.maintain()
+        closed = next(iter(pool._idle["1"]))
+        api.close_browser({"user_id": closed}, {})
+        await pool.maintain()
+        return list(pool._idle["1"])
+
+    idle = asyncio.run(scenario())
+
+    assert api.calls["start_browser"] == 3
+    assert len(idle) == 2 and set(idle) <= set(api.opened)
+
+def test_release_tools(api, pool):
+    async def scenario() -> tuple:
+        leased = await main.lease_browser("2")
+        user_id = leased.split()[1]
+        return leased, await main.release_browser(user_id, close=True), await main.release_browser(user_id), user_id
+
+    leased, closed, unknown, user_id = asyncio.run(scenario())
+
+    assert leased.startswith(f"Browser {user_id} leased (cold start) with:")
+    assert closed == f"Browser {user_id} released and closed"
+    assert unknown == f"Failed to release browser {user_id}, error: browser {user_id} is not leased from the pool"
+    assert user_id not in api.opened
+
+def test_sse_pool_outlives_client_sessions(api):
+    async def scenario() -> tuple:
+        app = main.mcp.sse_app()
+        async with app.router.lifespan_context(app):
+            async with main.app_lifespan(main.mcp):
+                pass
+            running = [not task.done() for task in main._background_tasks]
+        return running, main._background_tasks
+
+    running, after_shutdown = asyncio.run(scenario())
+
+    assert running and all(running)
+    assert after_shutdown == []
@@ -0,0 +1,53 @@
+import asyncio
+
+import main
+
+def count_upserts(monkeypatch) -> list:
+    written = []
+    upsert = main.profile_index.upsert
+    monkeypatch.setattr(main.profile_index, "upsert", lambda profiles: (written.extend(profiles), upsert(profiles)))
+    return written
+
+def test_rebuild_writes_each_profile_once(api, monkeypatch):
+    written = count_upserts(monkeypatch)
+
+    asyncio.run(main.profile_index.rebuild())
+
+    assert sorted(profile["user_id"] for profile in written) == sorted(api.profiles)
+
+def test_list_reads_outside_a_rebuild_update_the_index(api):
+    user_id = next(iter(api.profiles))
+
+    async def scenario() -> tuple:
+        await main.profile_index.rebuild()
+        api.profiles[user_id]["name"] = "renamed elsewhere"
+        await main.get_browser_list(browser_id=user_id)
+        return main.profile_index.search({"name": "renamed elsewhere"})
+
+    total, profiles = asyncio.run(scenario())
+
+    assert total == 1 and profiles[0]["user_id"] == user_id
+
+def test_search_by_name_group_and_proxy(api):
+    first = next(iter(api.profiles.values()))
+
+    result = asyncio.run(main.search_browsers(name="shop-1*", group_id=first["group_id"], format="tsv", fields=["user_id", "name"]))
+
+    expected = [profile["user_id"] for profile in api.profiles.values()
+                if profile["name"].startswith("shop-1") and profile["group_id"] == first["group_id"]]
+    assert [line.split("\t")[0] for line in result.splitlines()[2:]] == expected
+    proxy_host = first["user_proxy_config"]["proxy_host"]
+    assert first["user_id"] in asyncio.run(main.search_browsers(proxy_host=proxy_host))
+
+def test_group_change_clears_the_stale_group_name(api):
+    user_id, profile = next((user_id, profile) for user_id, profile in api.profiles.items() if profile["group_id"] != "2")
+
+    async def scenario() -> dict:
+        await main.profile_index.rebuild()
+        await main.update_browser(browser_id=user_id, group_id="2")
+        return main.profile_index.search({"user_id": user_id})[1][0]
+
+    indexed = asyncio.run(scenario())
+
+    assert indexed["group_id"] == "2"
+    assert indexed["group_name"] is None
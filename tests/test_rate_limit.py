@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+
+import main
+from mock_local_api import THROTTLED
+
+def test_endpoint_classes_share_one_bucket_by_default():
+    assert main.RATE_LIMITERS["browser"] is main.RATE_LIMITERS["profile"]
+
+def test_close_browser_is_sent_before_queued_list_reads(api, monkeypatch):
+    bucket = main.TokenBucket(rate=50, burst=1)
+    monkeypatch.setattr(main, "RATE_LIMITERS", {cls: bucket for cls in main.RATE_LIMITERS})
+    order = []
+
+    async def record(endpoint, request):
+        order.append(endpoint)
+
+    api.hooks.append(record)
+    user_id = next(iter(api.profiles))
+
+    async def scenario() -> None:
+        bucket.drain()
+        reads = [asyncio.create_task(main._send_request("get_browser_list", {"page": str(page)})) for page in range(1, 4)]
+        await asyncio.sleep(0)
+        close = asyncio.create_task(main._send_request("close_browser", {"user_id": user_id}))
+        await asyncio.gather(*reads, close)
+
+    asyncio.run(scenario())
+
+    assert order == ["close_browser"] + ["get_browser_list"] * 3
+
+def test_token_bucket_hands_out_tokens_in_priority_order():
+    bucket = main.TokenBucket(rate=100, burst=1)
+    order = []
+
+    async def take(priority: int) -> None:
+        await bucket.acquire(priority)
+        order.append(priority)
+
+    async def scenario() -> None:
+        bucket.drain()
+        tasks = [asyncio.create_task(take(priority)) for priority in (3, 2, 3, 0, 1)]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+
+    assert order == [0, 1, 2, 3, 3]
+
+def test_throttled_requests_are_retried(api, monkeypatch):
+    replies = [THROTTLED, THROTTLED, {"code": 0, "msg": "success", "data": {"list": []}}]
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        return httpx.Response(200, json=replies[len(sent) - 1])
+
+    monkeypatch.setattr(main, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url=main.LOCAL_API_BASE))
+    monkeypatch.setattr(main, "THROTTLE_BACKOFF", 0.001)
+
+    data = asyncio.run(main._send_request("get_opened_browser"))
+
+    assert data["code"] == 0
+    assert len(sent) == 3
+
+def test_throttle_retries_give_up_after_the_limit(api, monkeypatch):
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        return httpx.Response(200, json=THROTTLED)
+
+    monkeypatch.setattr(main, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url=main.LOCAL_API_BASE))
+    monkeypatch.setattr(main, "THROTTLE_BACKOFF", 0.001)
+
+    data = asyncio.run(main._send_request("get_opened_browser"))
+
+    assert main.is_throttled(data)
+    assert len(sent) == main.THROTTLE_MAX_RETRIES + 1
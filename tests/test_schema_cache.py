@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+import pytest
+from mcp.server.fastmcp.exceptions import ToolError
+
+import main
+
+def test_schema_cache_key_includes_mcp_version(tmp_path, monkeypatch):
+    path = str(tmp_path / "schemas.json")
+    key = main.ToolSchemaCache(path).key
+    monkeypatch.setattr(main.importlib.metadata, "version", lambda package: "0.0.0")
+
+    assert main.ToolSchemaCache(path).key != key
+
+def register(path: str) -> main.AdsPowerMCP:
+    server = main.AdsPowerMCP("schema-cache-test", schema_cache=path)
+    server.add_tool(main.update_browser)
+    server.schema_cache.save()
+    return server
+
+def test_second_process_registers_tools_from_the_cache(tmp_path):
+    path = str(tmp_path / "schemas.json")
+    generated = register(path)._tool_manager.get_tool("update_browser")
+    server = register(path)
+    cached = server._tool_manager.get_tool("update_browser")
+
+    assert isinstance(cached, main.CachedSchemaTool) and not isinstance(generated, main.CachedSchemaTool)
+    assert cached.parameters == generated.parameters
+    assert server.schema_cache.hits == 1
+
+def test_cached_tools_still_validate_their_arguments(api, tmp_path):
+    path = str(tmp_path / "schemas.json")
+    register(path)
+    server = register(path)
+    user_id = next(iter(api.profiles))
+
+    async def scenario() -> tuple:
+        updated = await server.call_tool("update_browser", {"browser_id": user_id, "name": "cached"})
+        with pytest.raises(ToolError):
+            await server.call_tool("update_browser", {"browser_id": user_id, "proxy_config": {"proxy_soft": "bogus"}})
+        return updated
+
+    updated = asyncio.run(scenario())
+
+    assert "successfully" in updated[0].text
+    assert api.profiles[user_id]["name"] == "cached"
+
+def test_cache_with_another_key_is_ignored(tmp_path):
+    path = tmp_path / "schemas.json"
+    path.write_text(json.dumps({"key": "stale", "tools": {"update_browser": {"parameters": {}, "context_kwarg": None}}}))
+
+    server = register(str(path))
+
+    assert not isinstance(server._tool_manager.get_tool("update_browser"), main.CachedSchemaTool)
+    assert json.loads(path.read_text())["key"] == server.schema_cache.key
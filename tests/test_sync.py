@@ -0,0 +1,50 @@
+import asyncio
+
+import main
+
+def desired_state(api) -> list:
+    first, second, third = list(api.profiles)[:3]
+    other_group = "2" if api.profiles[second]["group_id"] != "2" else "3"
+    return [
+        {"browser_id": first, "name": "renamed"},
+        {"browser_id": second, "group_id": other_group},
+        {"browser_id": third, "name": "renamed", "group_id": other_group if api.profiles[third]["group_id"] != other_group else "1"},
+    ]
+
+def test_dry_run_labels_each_change(api, tmp_path):
+    profiles = desired_state(api)
+
+    result = asyncio.run(main.sync_browsers(profiles=profiles, snapshot_path=str(tmp_path / "snapshot.json"), dry_run=True))
+
+    rows = {line.split(" | ")[0]: line.split(" | ")[-1] for line in result.splitlines()[2:]}
+    assert rows == {
+        profiles[0]["browser_id"]: "would update",
+        profiles[1]["browser_id"]: "would move",
+        profiles[2]["browser_id"]: "would update + move",
+    }
+    assert api.calls["update_browser"] == api.calls["move_browser"] == 0
+
+def test_second_sync_sends_no_writes(api, tmp_path):
+    profiles = desired_state(api)
+    snapshot_path = str(tmp_path / "snapshot.json")
+
+    first = asyncio.run(main.sync_browsers(profiles=profiles, snapshot_path=snapshot_path))
+    writes = api.calls["update_browser"] + api.calls["move_browser"]
+    second = asyncio.run(main.sync_browsers(profiles=profiles, snapshot_path=snapshot_path))
+
+    assert first.startswith("Synced 3 browsers (0 unchanged, 3 changed")
+    assert api.profiles[profiles[2]["browser_id"]]["group_id"] == profiles[2]["group_id"]
+    assert second.startswith("Synced 3 browsers (3 unchanged, 0 changed")
+    assert api.calls["update_browser"] + api.calls["move_browser"] == writes
+
+def test_missing_target_group_is_a_validation_error(api, tmp_path):
+    user_ids = list(api.profiles)[:20]
+    profiles = [{"browser_id": user_id, "group_id": "99"} for user_id in user_ids]
+
+    for dry_run in (True, False):
+        result = asyncio.run(main.sync_browsers(profiles=profiles, snapshot_path=str(tmp_path / "snapshot.json"), dry_run=dry_run))
+
+        assert result.startswith("Failed to sync browsers, 20 validation errors, nothing was sent:")
+        assert "item 19: group_id: group 99 does not exist" in result
+    assert api.calls["move_browser"] == api.calls["update_browser"] == 0
+    assert api.calls["get_browser_list"] == 0
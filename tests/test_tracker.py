@@ -0,0 +1,77 @@
+import asyncio
+
+import main
+
+def test_own_starts_and_closes_update_the_view(api):
+    user_id = next(iter(api.profiles))
+
+    async def scenario() -> tuple:
+        await main.start_browser(browser_id=user_id)
+        started = (main.browser_tracker.get(user_id), api.opened[user_id])
+        await main.close_browser(browser_id=user_id)
+        return started, main.browser_tracker.get(user_id)
+
+    (tracked, opened), closed = asyncio.run(scenario())
+
+    assert tracked["debug_port"] == opened["debug_port"]
+    assert closed is None
+    assert api.calls["get_opened_browser"] == 0
+
+def test_reconcile_picks_up_browsers_opened_elsewhere(api):
+    user_id = next(iter(api.profiles))
+    api.start_browser({"user_id": user_id}, {})
+
+    async def scenario() -> tuple:
+        return await main.browser_tracker.reconcile(), await main.browser_tracker.reconcile()
+
+    changed, changed_again = asyncio.run(scenario())
+
+    assert (changed, changed_again) == (True, False)
+    assert main.browser_tracker.get(user_id)["debug_port"] == api.opened[user_id]["debug_port"]
+
+def test_fresh_view_answers_without_the_api(api):
+    user_id = next(iter(api.profiles))
+    api.start_browser({"user_id": user_id}, {})
+
+    async def scenario() -> tuple:
+        first = await main.get_opened_browser(format="tsv", fields=["user_id"])
+        second = await main.get_opened_browser(format="tsv", fields=["user_id"])
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second == f"Opened browser list:\nuser_id\n{user_id}"
+    assert api.calls["get_opened_browser"] == 1
+
+def test_list_older_than_a_close_is_not_applied(api):
+    user_id = next(iter(api.profiles))
+    listed, release = asyncio.Event(), asyncio.Event()
+
+    async def hold_list(response):
+        if response.request.url.path == main.API_ENDPOINTS["get_opened_browser"]:
+            listed.set()
+            await release.wait()
+
+    main._http_client.event_hooks["response"].append(hold_list)
+
+    async def scenario() -> bool:
+        await main.start_browser(browser_id=user_id)
+        reconcile = asyncio.create_task(main.browser_tracker.reconcile())
+        await listed.wait()
+        await main.close_browser(browser_id=user_id)
+        release.set()
+        return await reconcile
+
+    changed = asyncio.run(scenario())
+
+    assert changed
+    assert main.browser_tracker.get(user_id) is None
+    assert main.browser_tracker._wake.is_set()
+    assert main.browser_tracker.synced_at is None
+
+def test_start_by_serial_number_wakes_the_reconciler(api):
+    serial_number = next(iter(api.profiles.values()))["serial_number"]
+
+    asyncio.run(main.start_browser(serial_number=serial_number))
+
+    assert main.browser_tracker._wake.is_set()
@@ -0,0 +1,57 @@
+import asyncio
+
+import httpx
+
+import main
+
+def test_sessions_share_one_set_of_background_tasks(api):
+    async def scenario() -> tuple:
+        async with main.app_lifespan(main.mcp):
+            tasks = list(main._background_tasks)
+            async with main.app_lifespan(main.mcp):
+                shared = main._background_tasks == tasks
+            still_running = not any(task.done() for task in tasks)
+        return tasks, shared, still_running
+
+    tasks, shared, still_running = asyncio.run(scenario())
+
+    assert shared and still_running
+    assert all(task.done() for task in tasks)
+    assert main._lifespan_sessions == 0 and main._http_client is None
+
+def test_sse_app_serves_prometheus_metrics(api):
+    async def scenario() -> httpx.Response:
+        app = main.mcp.sse_app()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mcp") as client:
+            return await client.get("/metrics")
+
+    response = asyncio.run(scenario())
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "adspower_startup_seconds" in response.text
+
+def test_max_concurrency_limits_tool_calls_in_flight(api, monkeypatch):
+    monkeypatch.setattr(main.mcp, "_tool_slots", None)
+    main.mcp.set_max_concurrency(1)
+    release = asyncio.Event()
+
+    async def hold_lists(endpoint, request):
+        if endpoint == "get_browser_list":
+            await release.wait()
+
+    api.hooks.append(hold_lists)
+
+    async def scenario() -> int:
+        calls = [asyncio.create_task(main.mcp.call_tool("get_browser_list", {"page": page, "size": 5})) for page in (1, 2)]
+        while not api.calls["get_browser_list"]:
+            await asyncio.sleep(0)
+        for _ in range(20):
+            await asyncio.sleep(0)
+        in_flight = api.calls["get_browser_list"]
+        release.set()
+        await asyncio.gather(*calls)
+        return in_flight
+
+    assert asyncio.run(scenario()) == 1
+    assert api.calls["get_browser_list"] == 2
@@ -0,0 +1,66 @@
+import asyncio
+
+import main
+
+def test_rule_errors_are_reported_alongside_type_errors():
+    spec = {
+        "group_id": "abc",
+        "fingerprint_config": 5,
+        "proxy_config": {"proxy_soft": "other", "proxy_type": "http", "proxy_host": "10.0.0.1", "proxy_port": "99999"},
+    }
+
+    arguments, errors = main.validate_profile_specs(main.create_browser, [spec])
+
+    assert arguments == []
+    assert "item 0: fingerprint_config: Input should be a valid dictionary" in errors
+    assert "item 0: group_id: must be a numeric string, got 'abc'" in errors
+    assert "item 0: proxy_config.proxy_port: must be a port number from 1 to 65535, got '99999'" in errors
+
+NO_PROXY = {"proxy_soft": "no_proxy", "proxy_type": None, "proxy_host": None, "proxy_port": None,
+            "proxy_user": None, "proxy_password": None, "proxy_url": None, "global_config": None}
+
+def test_valid_specs_pass():
+    specs = [{"group_id": "1", "name": f"shop-{i}", "proxy_config": NO_PROXY} for i in range(3)]
+
+    result = asyncio.run(main.validate_profiles(profiles=specs))
+
+    assert result.startswith("All 3 specs are valid for create_browser")
+
+def test_proxy_host_and_port_are_required_for_other():
+    spec = {"browser_id": "a1", "proxy_config": {**NO_PROXY, "proxy_soft": "other", "proxy_type": "socks5"}}
+
+    _, errors = main.validate_profile_specs(main.update_browser, [spec])
+
+    assert errors == [
+        "item 0: proxy_config.proxy_host: required when proxy_soft is 'other'",
+        "item 0: proxy_config.proxy_port: required when proxy_soft is 'other'",
+    ]
+
+def test_unknown_fields_are_rejected():
+    _, errors = main.validate_profile_specs(main.update_browser, [{"browser_id": "a1", "nmae": "typo"}])
+
+    assert errors[0] == "item 0: unknown fields ['nmae']"
+
+def test_cookie_formats():
+    netscape = ".example.com\tTRUE\t/\tFALSE\t0\tsid\tabc"
+    specs = [
+        {"browser_id": "a1", "cookie": netscape},
+        {"browser_id": "a2", "cookie": [{"name": "sid", "value": "abc", "domain": ".example.com"}]},
+        {"browser_id": "a3", "cookie": "[{\"name\": \"sid\""},
+        {"browser_id": "a4", "cookie": "not\ta cookie line"},
+    ]
+
+    _, errors = main.validate_profile_specs(main.update_browser, specs)
+
+    assert [error.split(":")[0] for error in errors] == ["item 2", "item 3"]
+    assert errors[0].startswith("item 2: cookie: invalid JSON")
+    assert errors[1] == "item 3: cookie: line 1: expected a JSON array or 7 tab-separated Netscape cookie fields"
+
+def test_batch_with_an_invalid_spec_sends_nothing(api):
+    specs = [{"group_id": "1", "name": "ok", "proxy_config": NO_PROXY},
+             {"group_id": "1", "name": "bad", "proxy_config": {**NO_PROXY, "proxy_soft": "ssh"}}]
+
+    result = asyncio.run(main.create_browsers(profiles=specs))
+
+    assert result.startswith("Failed to create browsers, 2 validation errors, nothing was sent:")
+    assert api.calls["create_browser"] == 0